@@ -1,43 +1,85 @@
 import re #Libreria para trabajar con expresiones regulares
 import os #Libreria para trabajar con archivos y el SO
 import json #Para trabajar en formato JSON
+import marshal #Formato binario rápido para la configuración compilada
+from collections import namedtuple
+
+# Patrón único sin grupos: findall recorre todo el texto en C y devuelve el
+# texto de cada token, sin crear un objeto Match por token. Lo que no es token
+# (espacios, saltos de línea, otros caracteres) lo salta la búsqueda; los
+# comentarios se capturan para descartarlos.
+TOKEN_RE = re.compile(
+    r'[{}\[\]=,:]|'   #Símbolos especiales
+    r'-?[0-9]+\.?[0-9]*|'   #Números o decimales (con signo)
+    r'"[^"\n]*"|'   #Elementos entre comillas
+    r'[A-Za-zÁÉÍÓÚáéíóúñÑ_][\wÁÉÍÓÚáéíóúñÑ_]*|'   #Identificadores
+    r'\#[^\n]*'   #Comentarios (se descartan)
+)
+# primer carácter -> tipo de token (None = comentario); el resto son identificadores
+TOKEN_KINDS = {**dict.fromkeys('{}[]=,:', 'OPERATOR'), **dict.fromkeys('-0123456789', 'NUMBER'),
+               '"': 'STRING', '#': None}
+
+
+#Token con su posición (línea y columna desde 1)
+Token = namedtuple("Token", "type value line col")
+
+
+def make_token(text): #(tipo, valor) del texto de un token, o None si es un comentario
+    kind = TOKEN_KINDS.get(text[0], 'IDENTIFIER')
+    if kind == 'NUMBER':
+        return kind, float(text) if '.' in text else int(text)
+    if kind == 'STRING':
+        return kind, text[1:-1]
+    return (kind, text) if kind else None
+
+
+class _TokenTable(dict):
+    # texto -> (tipo, valor), armado la primera vez que aparece cada texto: en
+    # una configuración se repiten pocos textos distintos, así que casi todos
+    # los tokens salen de un dict.__getitem__ sin código Python por token
+    def __missing__(self, text):
+        tok = self[text] = make_token(text)
+        return tok
+
 
 class Tokenizer: #Analizador léxico, donde se guarda el código y se almacenan los tokens
     def __init__(self, source_code):
         self.source = source_code
         self.tokens = []
 
-    def tokenize(self):
-        lines = self.source.splitlines() #Divide el código en lineas, elimina espacios blancos
-        for line in lines:
-            line = line.strip()
-            if not line or line.startswith('#'):  
-                continue
+    def tokenize(self): #Lista de tuplas (tipo, valor) en una sola pasada
+        table = _TokenTable()
+        self.tokens = list(filter(None, map(table.__getitem__, TOKEN_RE.findall(self.source))))
+        return self.tokens
 
+    def position(self, index): #(línea, columna) desde 1 del token número `index`
+        # Las posiciones no se guardan: se recorre el texto otra vez solo cuando
+        # alguien las pide (un mensaje de error, token_at)
+        source = self.source
+        offset = len(source)
+        for match in TOKEN_RE.finditer(source):
+            if match.group()[0] == '#':
+                continue
+            if index == 0:
+                offset = match.start()
+                break
+            index -= 1
+        return source.count('\n', 0, offset) + 1, offset - source.rfind('\n', 0, offset)
 
-            line = line.split("#", 1)[0].strip()  
-            regex_tokens = re.findall(
-                r'"([^"]*)"|'   #Captura elementos entre comillas             
-                r'(\d+\.?\d*)|'     #Captura números o decimales
-                r'({|}|\[|\]|=|,|:)|'     #Captura los símbolos especiales   
-                r'([A-Za-zÁÉÍÓÚáéíóúñÑ_][\wÁÉÍÓÚáéíóúñÑ_]*)',  #Captura los identificadores
-                line
-            )
-            # Analizamos los grupos capturados y los convertimos en tokens
-            for group in regex_tokens:
-                if group[0]:  
-                    self.tokens.append(('STRING', group[0]))
-                elif group[1]:  
-                    if '.' in group[1]:
-                        self.tokens.append(('NUMBER', float(group[1])))
-                    else:
-                        self.tokens.append(('NUMBER', int(group[1])))
-                elif group[2]:  #
-                    self.tokens.append(('OPERATOR', group[2]))
-                elif group[3]:  
-                    self.tokens.append(('IDENTIFIER', group[3]))
+    def token_at(self, index): #Token(tipo, valor, línea, columna) del token número `index`
+        if not self.tokens:
+            self.tokenize()
+        return Token(*self.tokens[index], *self.position(index))
 
-        return self.tokens
+    @staticmethod
+    def stream(file): #Genera Token leyendo un archivo abierto línea por línea
+        # Ningún token (ni comentario) cruza un salto de línea, así que cada
+        # línea se puede analizar sola y solo hay una línea en memoria a la vez
+        for line_no, line in enumerate(file, 1):
+            for match in TOKEN_RE.finditer(line):
+                tok = make_token(match.group())
+                if tok is not None:
+                    yield Token(tok[0], tok[1], line_no, match.start() + 1)
 
 
 def load_file_content(filepath): #Lee el contenido de un archivo y lo retorna como texto
@@ -49,6 +91,84 @@ def load_file_content(filepath): #Lee el contenido de un archivo y lo retorna co
         return file.read()
 
 
+def stream_config(filepath): #Genera (clave, valor) del archivo sin cargarlo completo
+    with open(filepath, 'r', encoding='utf-8') as file:
+        yield from Parser(Tokenizer.stream(file)).iter_assignments()
+
+
+# ============================
+# Caché de configuraciones compiladas
+# ============================
+CACHE_DIR = ".config_cache"
+CACHE_VERSION = 2
+
+
+def ast_path_for(filepath): #Snake.txt -> config_snake.ast (en la misma carpeta)
+    folder, name = os.path.split(filepath)
+    return os.path.join(folder, "config_" + os.path.splitext(name)[0].lower() + ".ast")
+
+
+def _cache_path(filepath, cache_dir):
+    folder, name = os.path.split(os.path.abspath(filepath))
+    return os.path.join(cache_dir or os.path.join(folder, CACHE_DIR), name + ".cfgc")
+
+
+def _read_cache(path): #(mtime_ns, tamaño, hash, config) o None si no sirve
+    try:
+        with open(path, 'rb') as f:
+            entry = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(entry, tuple) or len(entry) != 5 or entry[0] != CACHE_VERSION:
+        return None
+    return entry[1:]
+
+
+def _write_cache(path, st, digest, config):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, 'wb') as f:
+            marshal.dump((CACHE_VERSION, st.st_mtime_ns, st.st_size, digest, config), f)
+        os.replace(tmp, path)
+    except (OSError, ValueError):
+        pass  # sin caché no pasa nada: la próxima carga vuelve a compilar
+
+
+def load_config(filepath, cache_dir=None): #Configuración compilada, usando caché si sirve
+    # 1) mismo mtime y tamaño que la caché -> se usa sin leer el fuente
+    # 2) cambió el mtime pero el hash del contenido es igual -> se usa y se
+    #    actualiza el mtime guardado
+    # 3) si no, se tokeniza y se analiza de nuevo y se guarda la caché
+    # Si el fuente no existe se recurre al JSON .ast que generó guardar_configuracion
+    cache = _cache_path(filepath, cache_dir)
+    try:
+        st = os.stat(filepath)
+    except OSError:
+        ast_file = ast_path_for(filepath)
+        if os.path.exists(ast_file):
+            with open(ast_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        raise FileNotFoundError(f"El archivo '{filepath}' no existe.")
+
+    entry = _read_cache(cache)
+    if entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+        return entry[3]
+
+    import hashlib #solo hace falta si la caché no coincide (y así el import es liviano)
+    with open(filepath, 'rb') as f:
+        data = f.read()
+    digest = hashlib.sha256(data).hexdigest()
+    if entry and entry[2] == digest:
+        _write_cache(cache, st, digest, entry[3])
+        return entry[3]
+
+    tokenizer = Tokenizer(data.decode('utf-8'))
+    config = Parser(tokenizer.tokenize(), tokenizer.position).parse()
+    _write_cache(cache, st, digest, config)
+    return config
+
+
 def analizar_archivo(filepath, titulo): #Tokeniza y muestra los tokens de un archivo
     source_code = load_file_content(filepath)
     if source_code:
@@ -57,35 +177,58 @@ def analizar_archivo(filepath, titulo): #Tokeniza y muestra los tokens de un arc
         tokens = tokenizer.tokenize()
         for token in tokens:
             print(token)
-            
-# Probamos con los archivos Snake y Tetris
-analizar_archivo("Snake.txt", "Snake")
-analizar_archivo("Tetris.txt", "Tetris")
 
 
+EOF_TOKEN = ('EOF', None)
 
 
 class Parser:
-    def __init__(self, tokens):
+    # `tokens` puede ser una lista o cualquier iterable (p. ej. Tokenizer.stream):
+    # se consume con un solo token de anticipación. `locate(índice)` da la línea
+    # y columna de un token (p. ej. Tokenizer.position) para los errores
+    def __init__(self, tokens, locate=None):
         self.tokens = tokens
+        self.locate = locate
         self.pos = 0
+        self._next = iter(tokens).__next__
+        self._current = self._advance()
+    # Lee el siguiente token del iterable (EOF al agotarse)
+    def _advance(self):
+        try:
+            return self._next()
+        except StopIteration:
+            return EOF_TOKEN
     #   Devuelve el token actual o EOF si ya no hay más
     def current_token(self):
-        return self.tokens[self.pos] if self.pos < len(self.tokens) else ('EOF', None)
+        return self._current
+    # Posición del token actual para los mensajes de error (si la tiene)
+    def _where(self, tok):
+        if len(tok) > 3:
+            line, col = tok[2], tok[3]
+        elif self.locate is not None:
+            line, col = self.locate(self.pos)
+        else:
+            return ""
+        return f" (línea {line}, columna {col})"
     # Avanza al siguiente token verificando tipo y valor esperado
     def eat(self, expected_type=None, expected_value=None):
-        tok_type, tok_val = self.current_token()
+        tok = self._current
+        tok_type, tok_val = tok[0], tok[1]
         if expected_type and tok_type != expected_type:
-            raise SyntaxError(f"Se esperaba {expected_type}, pero se encontró {tok_type}")
+            raise SyntaxError(f"Se esperaba {expected_type}, pero se encontró {tok_type}{self._where(tok)}")
         if expected_value and tok_val != expected_value:
-            raise SyntaxError(f"Se esperaba {expected_value}, pero se encontró {tok_val}")
+            raise SyntaxError(f"Se esperaba {expected_value}, pero se encontró {tok_val}{self._where(tok)}")
         self.pos += 1
+        self._current = self._advance()
         return tok_val
+    # Genera las asignaciones de primer nivel a medida que se leen
+    def iter_assignments(self):
+        while self._current[0] != 'EOF':
+            yield self.parse_assignment()
     # Inicia el análisis y construye un diccionario de configuraciones
     def parse(self):
         config = {}
-        while self.current_token()[0] != 'EOF':
-            key, value = self.parse_assignment()
+        for key, value in self.iter_assignments():
             config[key] = value
         return config
     # Analiza asignaciones del tipo: clave = valor
@@ -96,7 +239,8 @@ class Parser:
         return key, value
     # Analiza el valor de una asignación
     def parse_value(self):
-        tok_type, tok_val = self.current_token()
+        tok = self.current_token()
+        tok_type, tok_val = tok[0], tok[1]
 
         if tok_type in ('STRING', 'NUMBER', 'IDENTIFIER'):
             self.eat()
@@ -106,7 +250,7 @@ class Parser:
         elif tok_type == 'OPERATOR' and tok_val == '[':
             return self.parse_list()
         else:
-            raise SyntaxError(f"Valor inesperado: {tok_type}, {tok_val}")
+            raise SyntaxError(f"Valor inesperado: {tok_type}, {tok_val}{self._where(tok)}")
     # Analiza diccionarios { clave = valor }
     def parse_dict(self):
         self.eat('OPERATOR', '{')
@@ -130,7 +274,7 @@ class Parser:
         return lst
     # Guarda la configuración en un archivo JSON
     def guardar_configuracion(self, config, filename):
-        ruta_archivo = "./" + filename
+        ruta_archivo = os.path.join(".", filename)
         try:
             with open(ruta_archivo, 'w', encoding='utf-8') as f:
                 json.dump(config, f, ensure_ascii=False, indent=4)
@@ -138,25 +282,51 @@ class Parser:
         except Exception as e:
             print(f"Error al guardar la configuración: {e}")
 
-source_code_snake = load_file_content("Snake.txt")
-tokens_snake = Tokenizer(source_code_snake).tokenize()
-tokens_snake.append(('EOF', None))
-parser_snake = Parser(tokens_snake)
-config_snake = parser_snake.parse()
-config_snake_filename = "config_snake.ast"
-parser_snake.guardar_configuracion(config_snake, config_snake_filename)
+# ============================
+# Línea de comandos
+# ============================
+# Importar el módulo solo define las clases y funciones; el trabajo se hace
+# desde aquí:  python -m analisador compile Snake.txt
+
+def compilar_archivo(filepath, salida=None): #Analiza, guarda el .ast y muestra la configuración
+    source_code = load_file_content(filepath)
+    if source_code is None:
+        return None
+    tokenizer = Tokenizer(source_code)
+    parser = Parser(tokenizer.tokenize(), tokenizer.position)
+    config = parser.parse()
+    parser.guardar_configuracion(config, salida or ast_path_for(filepath))
+    print(f"\n=== CONFIGURACIÓN {os.path.splitext(os.path.basename(filepath))[0].upper()} ===")
+    print(json.dumps(config, indent=4, ensure_ascii=False))
+    return config
+
 
-print("\n=== CONFIGURACIÓN SNAKE ===")
-print(json.dumps(config_snake, indent=4, ensure_ascii=False))
+def main(argv=None):
+    import argparse
+    ap = argparse.ArgumentParser(prog="analisador",
+                                 description="Analizador de los archivos de configuración de los juegos")
+    sub = ap.add_subparsers(dest="comando")
+    p_tokens = sub.add_parser("tokens", help="muestra los tokens de un archivo")
+    p_tokens.add_argument("archivo")
+    p_compile = sub.add_parser("compile", help="analiza un archivo y guarda su .ast")
+    p_compile.add_argument("archivo")
+    p_compile.add_argument("-o", "--salida", help="archivo .ast de salida (por defecto config_<nombre>.ast)")
+    sub.add_parser("demo", help="tokens y .ast de Snake.txt y Tetris.txt (comportamiento original)")
+    args = ap.parse_args(argv)
 
+    if args.comando == "tokens":
+        analizar_archivo(args.archivo, os.path.basename(args.archivo))
+    elif args.comando == "compile":
+        if compilar_archivo(args.archivo, args.salida) is None:
+            return 1
+    else:
+        # Probamos con los archivos Snake y Tetris
+        analizar_archivo("Snake.txt", "Snake")
+        analizar_archivo("Tetris.txt", "Tetris")
+        compilar_archivo("Snake.txt")
+        compilar_archivo("Tetris.txt")
+    return 0
 
-source_code_tetris = load_file_content("Tetris.txt")
-tokens_tetris = Tokenizer(source_code_tetris).tokenize()
-tokens_tetris.append(('EOF', None))
-parser_tetris = Parser(tokens_tetris)
-config_tetris = parser_tetris.parse()
-config_tetris_filename = "config_tetris.ast"
-parser_tetris.guardar_configuracion(config_tetris, config_tetris_filename)
 
-print("\n=== CONFIGURACIÓN TETRIS ===")
-print(json.dumps(config_tetris, indent=4, ensure_ascii=False))
\ No newline at end of file
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,132 @@
+# ============================
+# Sonido
+# ============================
+# Los sonidos se cargan una sola vez al iniciar y cada categoría tiene sus
+# propios canales de pygame.mixer reservados, así una ráfaga de teclas no le
+# quita el canal al sonido de comer. Cada sonido tiene un intervalo mínimo
+# entre reproducciones y, si todos sus canales están ocupados, reemplaza la
+# voz más vieja. Sin pygame, sin dispositivo de audio (o con el driver
+# "dummy" de SDL) se usa NullAudio, que no hace nada. pygame se importa recién
+# en open_audio(): importar este módulo no lo carga.
+
+import os
+import time
+
+AUDIO_ENV = "MASTERGAME_AUDIO"   # "off" para desactivar el sonido
+
+# nombre -> (archivo, canales reservados, intervalo mínimo en ms, volumen)
+SOUNDS = {
+    "key": ("keyboard.wav", 2, 45, 0.7),
+    "eat": ("eating.wav", 2, 60, 1.0),
+}
+
+
+class NullAudio:
+    """Backend mudo: misma interfaz que Audio, no hace nada."""
+
+    enabled = False
+
+    def play(self, name, now=None):
+        return False
+
+    def close(self):
+        pass
+
+
+class Audio:
+    """Sonidos precargados sobre pools de canales reservados por categoría."""
+
+    enabled = True
+
+    def __init__(self, sounds=SOUNDS, base_dir=""):
+        import pygame
+        self.mixer = pygame.mixer
+        self.error = pygame.error
+        # buffer chico: menos latencia entre la tecla y el sonido
+        pygame.mixer.pre_init(44100, -16, 2, 512)
+        pygame.mixer.init()
+        self.sounds = {}
+        self.pools = {}
+        self.started = {}      # nombre -> hora de inicio de cada canal del pool
+        self.min_interval = {}
+        self.last = {}
+        self.limited = 0       # reproducciones descartadas por el límite
+        self.stolen = 0        # voces reemplazadas con el pool lleno
+
+        available = {}
+        for name, (filename, _, _, volume) in sounds.items():
+            path = os.path.join(base_dir, filename)
+            if os.path.exists(path):
+                sound = pygame.mixer.Sound(path)
+                sound.set_volume(volume)
+                available[name] = sound
+
+        # los canales reservados no los usa Sound.play() por su cuenta
+        total = sum(sounds[name][1] for name in available)
+        pygame.mixer.set_num_channels(max(total, 8))
+        pygame.mixer.set_reserved(total)
+        next_channel = 0
+        for name, sound in available.items():
+            _, channels, interval_ms, _ = sounds[name]
+            self.sounds[name] = sound
+            self.pools[name] = [pygame.mixer.Channel(next_channel + i) for i in range(channels)]
+            self.started[name] = [0.0] * channels
+            self.min_interval[name] = interval_ms / 1000.0
+            self.last[name] = float("-inf")
+            next_channel += channels
+
+    def play(self, name, now=None):
+        """Reproduce `name` si pasó su intervalo mínimo. True si sonó."""
+        sound = self.sounds.get(name)
+        if sound is None:
+            return False
+        now = time.perf_counter() if now is None else now
+        if now - self.last[name] < self.min_interval[name]:
+            self.limited += 1
+            return False
+        pool = self.pools[name]
+        started = self.started[name]
+        try:
+            for i, channel in enumerate(pool):
+                if not channel.get_busy():
+                    break
+            else:
+                # pool lleno: la voz más vieja deja su canal
+                i = started.index(min(started))
+                self.stolen += 1
+            pool[i].play(sound)
+        except self.error:
+            return False
+        started[i] = now
+        self.last[name] = now
+        return True
+
+    def close(self):
+        try:
+            self.mixer.quit()
+        except Exception:
+            pass
+
+
+def open_audio(sounds=SOUNDS, base_dir=""):
+    """Audio si hay pygame, dispositivo y algún sonido; si no, NullAudio."""
+    if os.environ.get(AUDIO_ENV) == "off" or os.environ.get("SDL_AUDIODRIVER") == "dummy":
+        return NullAudio()
+    try:
+        import pygame
+    except ImportError:
+        return NullAudio()
+    try:
+        audio = Audio(sounds, base_dir)
+    except Exception as e:
+        # pygame.error sin dispositivo, archivos dañados, etc.
+        print(f"Sonido desactivado: {e}")
+        try:
+            pygame.mixer.quit()
+        except Exception:
+            pass
+        return NullAudio()
+    if not audio.sounds:
+        audio.close()
+        return NullAudio()
+    return audio
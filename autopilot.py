@@ -0,0 +1,422 @@
+# ============================
+# Piloto automático de Snake
+# ============================
+# Trabaja sobre la grilla de ocupación de engine.SnakeEngine (celda = y*cols+x)
+# con una tabla de vecinos precalculada y buffers de BFS reutilizados (marca
+# por generación, padre y cola en arreglos), así una búsqueda no crea objetos
+# por nodo.
+#
+# Si el tablero admite un ciclo hamiltoniano (algún lado par) y el cuerpo queda
+# en orden (de la cola a la cabeza) sobre él, sigue el ciclo y solo toma atajos (el vecino más cerca de
+# la comida según un BFS, o el que más adelanta) cuando no se salta su propia
+# cola en el orden del ciclo: así nunca se encierra y puede llenar el tablero.
+# Mientras no hay ciclo usa BFS a la comida con chequeo de que la cola siga
+# alcanzable y, si no, persigue la cola.
+#
+#   python autopilot.py --cols 30 --rows 20 --games 3
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from array import array
+from collections import deque
+
+from engine import SnakeEngine, DIRECTIONS, UP, DOWN, LEFT, RIGHT
+
+MOVES = (UP, DOWN, LEFT, RIGHT)   # orden de los vecinos en la tabla
+RETRY_TICKS = 4   # pasos de espera antes de volver a buscar una comida insegura
+DECISION_SAMPLES = 10000   # tiempos de decisión guardados (los últimos)
+
+
+def neighbour_table(cols, rows):
+    """Por celda, la celda vecina en cada dirección de MOVES (-1 = borde)."""
+    table = []
+    for y in range(rows):
+        for x in range(cols):
+            cells = []
+            for action in MOVES:
+                dx, dy = DIRECTIONS[action]
+                nx, ny = x + dx, y + dy
+                cells.append(ny*cols + nx if 0 <= nx < cols and 0 <= ny < rows else -1)
+            table.append(tuple(cells))
+    return table
+
+
+def serpentine(cols, rows, transpose=False):
+    """Orden de un ciclo hamiltoniano (lista de celdas), o None si no existe.
+
+    Recorre la primera fila completa, zigzaguea el resto sin tocar la primera
+    columna y vuelve por ella. Necesita una cantidad par de filas (o de
+    columnas con `transpose`).
+    """
+    a, b = (rows, cols) if transpose else (cols, rows)   # a = largo de cada pasada
+    if b % 2 or a < 2 or b < 2:
+        return None
+    cell = (lambda i, j: i*cols + j) if transpose else (lambda i, j: j*cols + i)
+    order = [cell(i, 0) for i in range(a)]
+    for j in range(1, b):
+        span = range(a - 1, 0, -1) if j % 2 else range(1, a)
+        order.extend(cell(i, j) for i in span)
+    order.extend(cell(0, j) for j in range(b - 1, 0, -1))
+    return order
+
+
+class SnakeAutopilot:
+    """Decide la dirección de la serpiente en cada paso de lógica."""
+
+    def __init__(self, engine, late_ms=None):
+        self.engine = engine
+        cols, rows = engine.cols, engine.rows
+        n = self.n = cols * rows
+        self.cols = cols
+        self.neighbours = neighbour_table(cols, rows)
+        # buffers de BFS
+        self.stamp = array("I", bytes(4 * n))
+        self.parent = array("i", bytes(4 * n))
+        self.queue = array("i", bytes(4 * n))
+        self.generation = 0
+        self.virtual = bytearray(n)
+        self.unreached = array("i", [-1]) * n
+        self.field = array("i", self.unreached)   # distancia a la comida
+        self.tail_field = array("i", self.unreached)   # distancia a la cola
+        self.max_growth = max(max(food[1] for food in engine.foods), 1)
+        self.decision_ms = deque(maxlen=DECISION_SAMPLES)   # tiempo de las últimas decisiones
+        self.worst_ms = 0.0      # la decisión más lenta de toda la partida
+        self.late_ms = late_ms   # con un valor, `late` cuenta las decisiones más lentas
+        self.late = 0
+
+        # posición de cada celda en cada ciclo posible (ambos sentidos)
+        self.cycles = []
+        for transpose in (False, True):
+            cycle = serpentine(cols, rows, transpose)
+            if cycle is None:
+                continue
+            for seq in (cycle, cycle[::-1]):
+                order = array("i", bytes(4 * n))
+                for i, c in enumerate(seq):
+                    order[c] = i
+                self.cycles.append(order)
+        self.reset()
+
+    def reset(self):
+        """Nueva partida: olvida el ciclo y los caminos guardados."""
+        self.order = None
+        self.path = deque()
+        self.path_food = None
+        self.path_wait = 0
+        self.tail_path = deque()
+        self.field_food = None
+
+    # ---------------------------
+    # Búsqueda
+    # ---------------------------
+    def bfs(self, start, goal, grid, passable=-1):
+        """Camino más corto start -> goal (sin start) o None.
+
+        `passable` es una celda ocupada que igual se puede pisar (la cola).
+        """
+        self.generation += 1
+        gen = self.generation
+        stamp, parent, queue, nb = self.stamp, self.parent, self.queue, self.neighbours
+        stamp[start] = gen
+        queue[0] = start
+        head, tail = 0, 1
+        while head < tail:
+            c = queue[head]
+            head += 1
+            for m in nb[c]:
+                if m < 0 or stamp[m] == gen or (grid[m] and m != passable):
+                    continue
+                stamp[m] = gen
+                parent[m] = c
+                if m == goal:
+                    path = [m]
+                    while parent[m] != start:
+                        m = parent[m]
+                        path.append(m)
+                    path.reverse()
+                    return path
+                queue[tail] = m
+                tail += 1
+        return None
+
+    def flood(self, start, grid, out):
+        """Distancia BFS desde start a cada celda libre en `out` (-1 = no llega)."""
+        out[:] = self.unreached
+        queue, nb = self.queue, self.neighbours
+        out[start] = 0
+        queue[0] = start
+        head, tail = 0, 1
+        while head < tail:
+            c = queue[head]
+            head += 1
+            d = out[c] + 1
+            for m in nb[c]:
+                if m >= 0 and out[m] < 0 and not grid[m]:
+                    out[m] = d
+                    queue[tail] = m
+                    tail += 1
+        return out
+
+    def reachable_count(self, start, grid, passable=-1):
+        """Cantidad de celdas libres alcanzables desde start."""
+        self.generation += 1
+        gen = self.generation
+        stamp, queue, nb = self.stamp, self.queue, self.neighbours
+        stamp[start] = gen
+        queue[0] = start
+        head, tail = 0, 1
+        while head < tail:
+            c = queue[head]
+            head += 1
+            for m in nb[c]:
+                if m >= 0 and stamp[m] != gen and (not grid[m] or m == passable):
+                    stamp[m] = gen
+                    queue[tail] = m
+                    tail += 1
+        return tail - 1
+
+    def _safe_after(self, path):
+        """True si, tras recorrer `path` y comer, la cabeza aún alcanza la cola."""
+        engine = self.engine
+        cols = self.cols
+        body = deque(y*cols + x for x, y in engine.snake)
+        virtual = self.virtual
+        virtual[:] = engine.grid
+        pending = engine.pending
+        last = len(path) - 1
+        for i, c in enumerate(path):
+            body.appendleft(c)
+            virtual[c] = 1
+            if i == last:
+                # comer alarga en 1 y lo demás se cobra después (o encoge)
+                growth = engine.foods[engine.food_kind][1]
+                pending += max(growth - 1, 0)
+                for _ in range(1 - growth):
+                    if len(body) > 1:
+                        virtual[body.pop()] = 0
+            elif pending:
+                pending -= 1
+            else:
+                virtual[body.pop()] = 0
+        return self._reaches_tail(body[0], body[-1], virtual)
+
+    def _reaches_tail(self, head, tail, grid):
+        # la cola misma está ocupada: alcanza con llegar al lado
+        return head == tail or self.bfs(head, tail, grid, passable=tail) is not None
+
+    # ---------------------------
+    # Decisión
+    # ---------------------------
+    def _align(self):
+        """Adopta el primer ciclo en el que el cuerpo va hacia atrás desde la cabeza.
+
+        No hace falta que sea contiguo: alcanza con que cada segmento quede
+        detrás del anterior sin dar la vuelta completa al ciclo.
+        """
+        n, cols = self.n, self.cols
+        body = self.engine.snake
+        for order in self.cycles:
+            x, y = body[0]
+            prev = order[y*cols + x]
+            total = 0
+            for x, y in body:
+                pos = order[y*cols + x]
+                total += (prev - pos) % n
+                if total >= n:
+                    break
+                prev = pos
+            else:
+                self.order = order
+                return True
+        return False
+
+    def _action(self, head, nxt):
+        return MOVES[self.neighbours[head].index(nxt)]
+
+    def _food_path(self, head, food, grid):
+        """Camino seguro a la comida, reutilizado mientras la comida no cambie.
+
+        La cola se chequea una vez por camino: recorrerlo no cambia el veredicto.
+        Si el camino no era seguro se espera RETRY_TICKS pasos antes de volver
+        a buscar, en vez de repetir los dos BFS en cada paso.
+        """
+        path = self.path
+        if self.path_food == food:
+            if path and path[0] in self.neighbours[head] and all(not grid[c] for c in path):
+                return path
+            if not path and self.path_wait:
+                self.path_wait -= 1
+                return path
+        path = self.bfs(head, food, grid)
+        if path and self._safe_after(path):
+            self.path = deque(path)
+        else:
+            self.path = deque()
+            self.path_wait = RETRY_TICKS
+        self.path_food = food
+        return self.path
+
+    def _cycle_step(self, head, tail, food, grid):
+        """Paso sobre el ciclo, con atajos que no pasan la cola."""
+        engine = self.engine
+        n, order = self.n, self.order
+        dist = lambda a, b: (order[b] - order[a]) % n
+        empty = n - len(engine.snake) - engine.pending
+        dist_food = dist(head, food)
+        dist_tail = dist(head, tail)
+        # margen para lo que la serpiente todavía va a crecer
+        available = dist_tail - engine.pending - self.max_growth - 3
+        if empty < n // 2:
+            available = 0
+        elif dist_food < dist_tail:
+            available -= self.max_growth
+            if (dist_tail - dist_food) * 4 > empty:
+                available -= 10
+
+        limit = min(available, dist_food)
+
+        def allowed(c):
+            return c >= 0 and not grid[c] and dist(head, c) <= limit
+
+        best, best_d = None, 0
+        if limit > 1:
+            # campo de distancias a la comida: un BFS por comida, no por paso
+            # (las celdas que ya ocupa el cuerpo se descartan mirando la grilla)
+            if self.field_food != food:
+                self.flood(food, grid, self.field)
+                self.field_food = food
+            field = self.field
+            for c in self.neighbours[head]:
+                if allowed(c) and field[c] >= 0 and (best is None or field[c] < field[best]):
+                    best = c
+            if best is not None:
+                return best
+        for c in self.neighbours[head]:
+            if allowed(c) and dist(head, c) > best_d:
+                best, best_d = c, dist(head, c)
+        if best is not None:
+            return best
+        # siguiente celda del ciclo
+        for c in self.neighbours[head]:
+            if c >= 0 and dist(head, c) == 1:
+                return c
+        return None
+
+    def _free_step(self, head, tail, food, grid):
+        """Sin ciclo: BFS a la comida si es seguro; si no, seguir la cola.
+
+        El motor choca con la cola antes de moverla, así que nunca se pisa.
+        """
+        path = self._food_path(head, food, grid)
+        if path:
+            return path.popleft()
+        # si en este paso ya se hicieron los dos BFS de la comida, se sigue el
+        # camino a la cola del paso anterior: sus celdas siguen libres y la
+        # cola solo se aleja por celdas que deja libres
+        tail_path = self.tail_path
+        if (self.path_wait == RETRY_TICKS and tail_path and tail_path[0] in self.neighbours[head]
+                and not grid[tail_path[0]]):
+            return tail_path.popleft()
+        # entre los vecinos desde los que la cola sigue alcanzable, el que
+        # más lejos queda de ella (el camino largo deja lugar a la comida).
+        # Un solo BFS desde la cola sirve para todos: el camino más corto
+        # desde un vecino nunca vuelve a pasar por él.
+        field = self.flood(tail, grid, self.tail_field)
+        best = None
+        for c in self.neighbours[head]:
+            if c >= 0 and not grid[c] and field[c] >= 0 and (best is None or field[c] > field[best]):
+                best = c
+        if best is not None:
+            # camino más corto desde ahí hasta la cola, para el próximo paso
+            tail_path.clear()
+            c, d = best, field[best]
+            while d > 1:
+                d -= 1
+                c = next(m for m in self.neighbours[c] if m >= 0 and field[m] == d)
+                tail_path.append(c)
+            return best
+        tail_path.clear()
+        # la cola ya no se alcanza: el vecino con más lugar libre
+        best_area = -1
+        for c in self.neighbours[head]:
+            if c < 0 or grid[c]:
+                continue
+            area = self.reachable_count(c, grid)
+            if area > best_area:
+                best, best_area = c, area
+        return best
+
+    def next_action(self):
+        """Dirección para el próximo paso (o None si no hay salida)."""
+        t0 = time.perf_counter()
+        engine = self.engine
+        if engine.over or engine.food is None:
+            return None
+        cols = self.cols
+        hx, hy = engine.snake[0]
+        tx, ty = engine.snake[-1]
+        fx, fy = engine.food
+        head, tail, food = hy*cols + hx, ty*cols + tx, fy*cols + fx
+        grid = engine.grid
+        # sin ciclo todavía: se busca uno por paso (casi siempre falla en el
+        # primer segmento, así que es barato) y mientras tanto se usa BFS
+        if self.order is not None or (self.cycles and self._align()):
+            nxt = self._cycle_step(head, tail, food, grid)
+        else:
+            nxt = self._free_step(head, tail, food, grid)
+        ms = (time.perf_counter() - t0) * 1000
+        self.decision_ms.append(ms)
+        if ms > self.worst_ms:
+            self.worst_ms = ms
+        if self.late_ms is not None and ms > self.late_ms:
+            self.late += 1
+        return self._action(head, nxt) if nxt is not None else None
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Piloto automático de Snake sin interfaz")
+    ap.add_argument("--cols", type=int, default=30)
+    ap.add_argument("--rows", type=int, default=20)
+    ap.add_argument("--games", type=int, default=3)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--max-ticks", type=int, default=2000000)
+    ap.add_argument("--tick-ms", type=float, default=120,
+                    help="intervalo del juego: ninguna decisión debería pasarlo")
+    args = ap.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    late_total = 0
+    for game in range(args.games):
+        engine = SnakeEngine(args.cols, args.rows, seed=rng.randrange(2**32), length=3)
+        pilot = SnakeAutopilot(engine, late_ms=args.tick_ms)
+        ticks = 0
+        t0 = time.perf_counter()
+        while not engine.over and ticks < args.max_ticks:
+            engine.step(pilot.next_action())
+            ticks += 1
+        elapsed = time.perf_counter() - t0
+        times = sorted(pilot.decision_ms)
+        fill = len(engine.snake) / pilot.n * 100
+        late_total += pilot.late
+        line = (f"partida {game}: largo {len(engine.snake)} ({fill:.1f}%)  "
+                f"{'ganó' if engine.won else 'perdió' if engine.over else 'sin terminar'}  "
+                f"ticks {ticks}  ciclo {'sí' if pilot.order is not None else 'no'}  ")
+        if not times:
+            print(line + "sin decisiones")
+            continue
+        # percentiles de las últimas DECISION_SAMPLES decisiones; máximo y
+        # decisiones tarde, de toda la partida
+        p99 = times[min(len(times) - 1, int(0.99 * len(times)))]
+        print(line + f"decisión p50 {statistics.median(times):.3f} ms  p99 {p99:.3f} ms  "
+              f"máx {pilot.worst_ms:.1f} ms  {ticks / elapsed:,.0f} ticks/s")
+        print(f"  peor caso: {pilot.worst_ms:.1f} ms de {args.tick_ms:g} ms por tick, "
+              f"{pilot.late} decisiones más lentas que el tick"
+              f"{'' if pilot.cycles else ' (tablero impar: sin ciclo, siempre BFS)'}")
+    return 1 if late_total else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
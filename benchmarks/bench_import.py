@@ -0,0 +1,65 @@
+# ============================
+# Benchmark: costo de importar analisador.py
+# ============================
+# Compara `import analisador` (solo define clases y funciones) con
+# `python -m analisador demo`, que hace lo mismo que hacía el import antes:
+# tokenizar e imprimir Snake.txt y Tetris.txt, analizarlos y guardar los .ast.
+# Cada caso corre en un proceso nuevo dentro de una carpeta temporal para no
+# tocar los .ast del proyecto; al tiempo se le resta el arranque del intérprete.
+#
+#   python benchmarks/bench_import.py [-n 15] [--json resultado.json]
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FILES = ("analisador.py", "Snake.txt", "Tetris.txt")
+
+CASES = {
+    "interprete": ["-c", "pass"],
+    "import": ["-c", "import analisador"],
+    "import_anterior (demo)": ["-m", "analisador", "demo"],
+}
+
+
+def medir(args, cwd, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, "-B"] + args, cwd=cwd, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        tiempos.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(tiempos)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Costo de importar analisador.py")
+    ap.add_argument("-n", "--repeticiones", type=int, default=15)
+    ap.add_argument("--json", help="guardar los resultados en este archivo")
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in FILES:
+            shutil.copy(os.path.join(ROOT, name), tmp)
+        resultados = {name: medir(cmd, tmp, args.repeticiones) for name, cmd in CASES.items()}
+
+    base = resultados["interprete"]
+    print(f"{'caso':26} {'total ms':>10} {'sin arranque ms':>16}")
+    for name, ms in resultados.items():
+        print(f"{name:26} {ms:10.2f} {ms - base:16.2f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"median_ms": resultados, "repeticiones": args.repeticiones}, f, indent=4)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
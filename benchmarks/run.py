@@ -0,0 +1,412 @@
+# ============================
+# Benchmarks de los caminos calientes
+# ============================
+# Mide el motor (colisiones, líneas, rotación, bloqueo + pieza nueva, paso de
+# Snake y sorteo de comida), el analizador de configuración y, si hay display
+# (p. ej. `xvfb-run`), el render sobre un canvas de Tk (con items o con la imagen
+# de render_pillow.py, en tablero normal y grande) contando items creados
+# por frame. Los resultados se guardan en JSON para comparar entre commits.
+#
+#   python benchmarks/run.py --json bench_HEAD.json
+#   python benchmarks/run.py --compare bench_base.json --filter snake
+#   xvfb-run python benchmarks/run.py --json bench_render.json
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from analisador import Tokenizer, Parser                                   # noqa: E402
+from engine import (TetrisEngine, SnakeEngine, rotate_matrix, piece_rotations,  # noqa: E402
+                    TETRIS_PIECES, LEFT, RIGHT, DOWN, DROP, ROTATE, TICK)
+from render import TetrisRenderer, SnakeRenderer, tetris_palette            # noqa: E402
+from render_pillow import PILLOW, PillowTetrisRenderer, PillowSnakeRenderer  # noqa: E402
+
+SNAKE_LENGTHS = (10, 100, 500)
+CONFIG_SCALES = (1, 10, 100)
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """Registra `fn()` que devuelve (setup, run, ops por llamada)."""
+    def register(fn):
+        BENCHMARKS[name] = fn
+        return fn
+    return register
+
+
+def measure(setup, run, ops, repeat, min_time):
+    """Mediana y mínimo en µs por operación; setup() no se cronometra."""
+    samples = []
+    for _ in range(repeat):
+        elapsed = 0.0
+        calls = 0
+        while elapsed < min_time:
+            state = setup()
+            t0 = time.perf_counter()
+            run(state)
+            elapsed += time.perf_counter() - t0
+            calls += 1
+        samples.append(elapsed / (calls * ops) * 1e6)
+    median = statistics.median(samples)
+    return {"median_us": median, "min_us": min(samples), "ops_per_s": 1e6 / median if median else 0.0}
+
+
+# ---------------------------
+# Tetris
+# ---------------------------
+def midgame_tetris(seed=1, pieces=12):
+    """Motor con un tablero a medio llenar (piezas soltadas al azar)."""
+    engine = TetrisEngine(seed=seed)
+    rng = random.Random(seed)
+    while engine.placed < pieces:
+        for _ in range(rng.randint(0, 4)):
+            engine.step(rng.choice((LEFT, RIGHT, ROTATE)))
+        engine.step(DROP)
+        if engine.over:
+            engine.reset(seed)
+    return engine
+
+
+@benchmark("tetris.collides")
+def bench_collides():
+    engine = midgame_tetris()
+    probes = [(x, y, engine.footprints[p][r]) for p in range(len(engine.footprints))
+              for r in range(len(engine.footprints[p])) for x in range(-1, engine.width)
+              for y in range(engine.height)]
+    def run(_):
+        collides = engine.collides
+        for x, y, masks in probes:
+            collides(x, y, masks)
+    return (lambda: None), run, len(probes)
+
+
+@benchmark("tetris.clear_lines")
+def bench_clear_lines():
+    engine = midgame_tetris()
+    rows = list(engine.rows)
+    colors = bytes(engine.colors)
+    # 4 filas llenas intercaladas
+    for y in range(engine.height - 8, engine.height, 2):
+        rows[y] = engine.full
+    def setup():
+        engine.rows = list(rows)
+        engine.colors = bytearray(colors)
+        return engine
+    return setup, (lambda e: e.clear_lines()), 1
+
+
+@benchmark("tetris.clear_lines_none")
+def bench_clear_lines_none():
+    engine = midgame_tetris()
+    engine.rows = [r & ~1 for r in engine.rows]   # ninguna fila llena
+    return (lambda: engine), (lambda e: e.clear_lines()), 1
+
+
+@benchmark("tetris.rotate_matrix")
+def bench_rotate_matrix():
+    matrices = [m for m, _ in TETRIS_PIECES]
+    def run(_):
+        for m in matrices:
+            rotate_matrix(m)
+    return (lambda: None), run, len(matrices)
+
+
+@benchmark("tetris.rotation_tables")
+def bench_rotation_tables():
+    matrices = [m for m, _ in TETRIS_PIECES]
+    def run(_):
+        for m in matrices:
+            piece_rotations(m)
+    return (lambda: None), run, len(matrices)
+
+
+@benchmark("tetris.rotate_step")
+def bench_rotate_step():
+    engine = midgame_tetris()
+    def run(e):
+        for _ in range(100):
+            e.step(ROTATE)
+    return (lambda: engine), run, 100
+
+
+@benchmark("tetris.lock_spawn")
+def bench_lock_spawn():
+    def setup():
+        return TetrisEngine(seed=7)
+    def run(e):
+        # soltar piezas hasta perder: cada DROP es bloqueo + líneas + pieza nueva
+        rng = random.Random(7)
+        while not e.over:
+            e.step(rng.choice((LEFT, RIGHT, ROTATE)))
+            e.step(DROP)
+    probe = setup()
+    run(probe)
+    return setup, run, probe.placed
+
+
+# ---------------------------
+# Snake
+# ---------------------------
+def long_snake(length):
+    """Serpiente recta de `length` segmentos con espacio para avanzar 200 celdas."""
+    engine = SnakeEngine(cols=2 * length + 420, rows=3, seed=1, length=length)
+    engine.food = None   # sin comida en el camino: solo avanza
+    return engine
+
+
+def bench_snake_step(length):
+    def factory():
+        def run(e):
+            step = e.step
+            for _ in range(200):
+                step()
+        return (lambda: long_snake(length)), run, 200
+    return factory
+
+
+for _length in SNAKE_LENGTHS:
+    benchmark(f"snake.step_len{_length}")(bench_snake_step(_length))
+
+
+@benchmark("snake.place_food_nearly_full")
+def bench_place_food():
+    cols = rows = 40
+    engine = SnakeEngine(cols=cols, rows=rows, seed=3)
+    rng = random.Random(3)
+    # ocupar todas las celdas menos 16
+    cells = list(engine.free)
+    rng.shuffle(cells)
+    for c in cells[16:]:
+        engine._occupy(c)
+    def run(e):
+        for _ in range(1000):
+            e.place_food()
+    return (lambda: engine), run, 1000
+
+
+# ---------------------------
+# Analizador
+# ---------------------------
+def config_source(scale):
+    with open(os.path.join(ROOT, "Tetris.txt"), encoding="utf-8") as f:
+        text = f.read()
+    return "\n".join([text] * scale)
+
+
+def bench_tokenize(scale):
+    def factory():
+        source = config_source(scale)
+        return (lambda: source), (lambda s: Tokenizer(s).tokenize()), 1
+    return factory
+
+
+def bench_parse(scale):
+    def factory():
+        tokens = Tokenizer(config_source(scale)).tokenize()
+        return (lambda: tokens), (lambda t: Parser(t).parse()), 1
+    return factory
+
+
+for _scale in CONFIG_SCALES:
+    benchmark(f"config.tokenize_x{_scale}")(bench_tokenize(_scale))
+    benchmark(f"config.parse_x{_scale}")(bench_parse(_scale))
+
+
+# ---------------------------
+# Render (necesita display)
+# ---------------------------
+class CountingCanvas:
+    """Envuelve un canvas y cuenta los items creados."""
+
+    def __init__(self, canvas):
+        self._canvas = canvas
+        self.created = 0
+
+    def __getattr__(self, name):
+        attr = getattr(self._canvas, name)
+        if name.startswith("create_"):
+            def create(*args, **kw):
+                self.created += 1
+                return attr(*args, **kw)
+            return create
+        return attr
+
+
+def make_canvas():
+    """Canvas de Tk de 800x600 o None si no hay display."""
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception:
+        return None
+    canvas = tk.Canvas(root, width=800, height=600, bg="black")
+    canvas.pack()
+    root.update()
+    return canvas
+
+
+def render_frames(canvas, frames, view, layout, step, draw):
+    """Dibuja `frames` frames; devuelve tiempos e items creados/tocados por frame."""
+    counting = CountingCanvas(canvas)
+    view.canvas = counting
+    layout()
+    draw()
+    first = counting.created
+    times, created, touched = [], [], []
+    for _ in range(frames):
+        step()
+        before = counting.created
+        t0 = time.perf_counter()
+        draw()
+        canvas.update_idletasks()
+        times.append((time.perf_counter() - t0) * 1e6)
+        created.append(counting.created - before)
+        touched.append(view.last_touched)
+    canvas.delete("all")
+    return {
+        "median_us": statistics.median(times),
+        "min_us": min(times),
+        "ops_per_s": 1e6 / statistics.median(times),
+        "first_frame_created": first,
+        "created_per_frame_mean": statistics.fmean(created),
+        "created_per_frame_max": max(created),
+        "touched_per_frame_mean": statistics.fmean(touched),
+    }
+
+
+def render_tetris(canvas, frames, view_cls=TetrisRenderer, width=10, height=20, cell=24):
+    engine = TetrisEngine(width=width, height=height, seed=5)
+    view = view_cls(canvas, tetris_palette(engine.color_names))
+    rng = random.Random(5)
+    def step():
+        engine.step(rng.choice((LEFT, RIGHT, ROTATE, DOWN, TICK, TICK)))
+        if engine.over:
+            engine.reset(5)
+    return render_frames(
+        canvas, frames, view,
+        lambda: view.layout(100, 20, engine.width, engine.height, cell, 800, 600), step,
+        lambda: view.draw(engine.colors, engine.cells(), engine.color, engine.score))
+
+
+def render_snake(canvas, frames, view_cls=SnakeRenderer, cols=30, rows=20, cell=20, length=10):
+    engine = SnakeEngine(cols, rows, seed=5, length=length)
+    view = view_cls(canvas)
+    rng = random.Random(5)
+    def step():
+        if rng.random() < 0.2:
+            engine.turn(rng.choice((LEFT, RIGHT, DOWN, "up")))
+        engine.step()
+        if engine.over:
+            engine.reset(5)
+    return render_frames(
+        canvas, frames, view, lambda: view.layout(100, 20, engine.cols, engine.rows, cell), step,
+        lambda: view.draw(engine.snake, engine.food, engine.score))
+
+
+def render_case(fn, **kw):
+    return lambda canvas, frames: fn(canvas, frames, **kw)
+
+
+# tablero normal y grande, con cada backend disponible
+RENDER_BENCHMARKS = {}
+for _suffix, (_tetris_cls, _snake_cls) in (("", (TetrisRenderer, SnakeRenderer)),
+                                          ("_pillow", (PillowTetrisRenderer, PillowSnakeRenderer))):
+    if _suffix and not PILLOW:
+        continue
+    RENDER_BENCHMARKS.update({
+        f"render.draw_tetris{_suffix}": render_case(render_tetris, view_cls=_tetris_cls),
+        f"render.draw_snake{_suffix}": render_case(render_snake, view_cls=_snake_cls),
+        f"render.draw_tetris_big{_suffix}": render_case(render_tetris, view_cls=_tetris_cls,
+                                                        width=60, height=45, cell=12),
+        f"render.draw_snake_big{_suffix}": render_case(render_snake, view_cls=_snake_cls,
+                                                       cols=80, rows=60, cell=8, length=40),
+    })
+
+
+# ---------------------------
+# Ejecución
+# ---------------------------
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, path):
+    with open(path, encoding="utf-8") as f:
+        base = json.load(f)["results"]
+    print(f"\ncomparado con {path}:")
+    for name, res in results.items():
+        old = base.get(name, {}).get("median_us")
+        if old and res.get("median_us"):
+            change = (res["median_us"] - old) / old * 100
+            print(f"  {name:32} {old:12.3f} -> {res['median_us']:12.3f} µs  {change:+7.1f}%")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmarks de MasterGame")
+    ap.add_argument("--json", help="guardar los resultados en este archivo")
+    ap.add_argument("--compare", help="JSON de una corrida anterior para comparar")
+    ap.add_argument("--filter", default="", help="solo los benchmarks que contengan este texto")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--min-time", type=float, default=0.2, help="segundos mínimos por repetición")
+    ap.add_argument("--frames", type=int, default=500, help="frames por benchmark de render")
+    ap.add_argument("--quick", action="store_true", help="1 repetición corta (para probar)")
+    args = ap.parse_args(argv)
+    if args.quick:
+        args.repeat, args.min_time, args.frames = 1, 0.02, 50
+
+    results = {}
+    for name, factory in BENCHMARKS.items():
+        if args.filter not in name:
+            continue
+        setup, run, ops = factory()
+        results[name] = measure(setup, run, ops, args.repeat, args.min_time)
+        print(f"{name:32} {results[name]['median_us']:12.3f} µs/op  "
+              f"{results[name]['ops_per_s']:14,.0f} op/s")
+
+    render = [name for name in RENDER_BENCHMARKS if args.filter in name]
+    canvas = make_canvas() if render else None
+    for name in render:
+        if canvas is None:
+            results[name] = {"skipped": "sin display (usar xvfb-run)"}
+            print(f"{name:32} omitido: sin display")
+            continue
+        results[name] = res = RENDER_BENCHMARKS[name](canvas, args.frames)
+        print(f"{name:32} {res['median_us']:12.3f} µs/frame  creados/frame "
+              f"{res['created_per_frame_mean']:.2f} (máx {res['created_per_frame_max']})")
+
+    data = {
+        "meta": {
+            "commit": git_commit(),
+            "time": time.time(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "min_time": args.min_time,
+        },
+        "results": results,
+    }
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=4, ensure_ascii=False)
+    if args.compare:
+        compare(results, args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,291 @@
+# ============================
+# Bot de Tetris
+# ============================
+# Para cada pieza prueba todas las rotaciones y columnas alcanzables, suelta
+# la pieza sobre una copia del bitboard y puntúa el tablero resultante con una
+# heurística lineal (huecos, altura total, irregularidad y líneas). Con
+# `lookahead` promedia además la mejor jugada de cada pieza posible para el
+# siguiente turno, explorando primero las mejores jugadas y sin pasarse del
+# presupuesto de tiempo que se le dé (en la interfaz la decisión corre dentro
+# de un frame). Las evaluaciones se guardan en una caché LRU por tablero,
+# así los tableros repetidos (muy comunes en la búsqueda) no se recalculan.
+#
+#   python bot.py --games 5 --config Tetris.txt --lookahead
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from collections import deque
+from functools import lru_cache
+
+from engine import TetrisEngine, LEFT, RIGHT, ROTATE, DROP, TICK
+
+# pesos de la heurística (Yiyuan Lee, "Tetris AI – The (Near) Perfect Bot")
+WEIGHTS = {"height": -0.510066, "lines": 0.760666, "holes": -0.35663, "bumpiness": -0.184483}
+
+CACHE_SIZE = 1 << 16
+TOP_K = 4   # jugadas que se exploran con lookahead
+DECISION_SAMPLES = 10000   # tiempos de decisión guardados (los últimos)
+
+
+if hasattr(int, "bit_count"):
+    popcount = int.bit_count
+else:   # Python < 3.10
+    def popcount(x):
+        return bin(x).count("1")
+
+
+def drop(rows, masks, x, y, height):
+    """Fila donde queda la pieza soltada desde (x, y), o None si choca ahí."""
+    shifted = masks[x]
+    last = height - len(shifted)
+    if y > last:
+        return None
+    for i, m in enumerate(shifted):
+        if rows[y+i] & m:
+            return None
+    # las filas vacías de arriba no pueden frenar la pieza: saltarlas
+    top = y
+    while top < height and not rows[top]:
+        top += 1
+    y = max(y, min(last, top - len(shifted)))
+    while y < last:
+        for i, m in enumerate(shifted):
+            if rows[y+1+i] & m:
+                return y
+        y += 1
+    return y
+
+
+def place(rows, masks, x, y):
+    """Copia de `rows` (tupla) con la pieza fija en (x, y)."""
+    board = list(rows)
+    for i, m in enumerate(masks[x]):
+        board[y+i] |= m
+    return tuple(board)
+
+
+class TetrisBot:
+    """Elige dónde poner cada pieza y la lleva ahí una acción a la vez."""
+
+    def __init__(self, weights=WEIGHTS, lookahead=False, top_k=TOP_K, cache_size=CACHE_SIZE):
+        self.weights = dict(weights)
+        self.lookahead = lookahead
+        self.top_k = top_k
+        self.evaluate = lru_cache(maxsize=cache_size)(self._evaluate)
+        self.decisions = 0
+        self.cut = 0            # decisiones cortadas por el presupuesto
+        self.decision_ms = deque(maxlen=DECISION_SAMPLES)   # tiempo de las últimas decisiones
+        self.worst_ms = 0.0     # la decisión más lenta desde clear_times()
+        self.reset()
+
+    def reset(self):
+        """Olvida la jugada en curso (nueva partida)."""
+        self._target = None
+        self._placed = None
+        self._actions = 0
+
+    # ---------------------------
+    # Heurística
+    # ---------------------------
+    def _evaluate(self, rows, width, height):
+        """(puntaje, tablero sin líneas llenas) para un tablero ya con la pieza."""
+        full = (1 << width) - 1
+        kept = [r for r in rows if r != full]
+        lines = height - len(kept)
+        board = (0,) * lines + tuple(kept)
+
+        heights = [0] * width
+        holes = 0
+        seen = 0
+        y = lines
+        while y < height and not board[y]:
+            y += 1
+        for y in range(y, height):
+            row = board[y]
+            if seen:
+                holes += popcount(seen & ~row)
+            new = row & ~seen
+            if new:
+                seen |= row
+                while new:
+                    low = new & -new
+                    heights[low.bit_length() - 1] = height - y
+                    new ^= low
+        bumpiness = sum(abs(heights[i] - heights[i+1]) for i in range(width - 1))
+        w = self.weights
+        score = (w["height"] * sum(heights) + w["lines"] * lines
+                 + w["holes"] * holes + w["bumpiness"] * bumpiness)
+        return score, board
+
+    # ---------------------------
+    # Búsqueda
+    # ---------------------------
+    def placements(self, engine, rows, pid, x0, y0, rot0):
+        """(rot, x, tablero con la pieza) para cada jugada alcanzable.
+
+        Se rota en la columna actual y se desliza a la fila y0 hasta la
+        columna destino; cualquier choque en ese camino descarta la jugada.
+        """
+        width, height = engine.width, engine.height
+        footprints = engine.footprints[pid]
+        out = []
+        for k in range(len(footprints)):
+            rot = (rot0 + k) % len(footprints)
+            masks = footprints[rot]
+            xs = min(max(x0, 0), len(masks) - 1)
+            if drop(rows, masks, xs, y0, height) is None:
+                continue
+            for step in (-1, 1):
+                x = xs
+                while 0 <= x < len(masks):
+                    y = drop(rows, masks, x, y0, height)
+                    if y is None:
+                        break
+                    if step == -1 or x != xs:
+                        out.append((rot, x, place(rows, masks, x, y)))
+                    x += step
+        return out
+
+    def _best_reply(self, engine, rows):
+        """Promedio, sobre las piezas posibles, del mejor puntaje inmediato."""
+        total = 0.0
+        width, height = engine.width, engine.height
+        for pid in range(len(engine.footprints)):
+            best = None
+            for rot, masks in enumerate(engine.footprints[pid]):
+                for x in range(len(masks)):
+                    y = drop(rows, masks, x, 0, height)
+                    if y is None:
+                        continue
+                    score = self.evaluate(place(rows, masks, x, y), width, height)[0]
+                    if best is None or score > best:
+                        best = score
+            # sin lugar para esa pieza: se pierde la partida
+            total += best if best is not None else -1e9
+        return total / len(engine.footprints)
+
+    def best_placement(self, engine, budget_ms=None):
+        """(rot, x) de la mejor jugada para la pieza activa, o None.
+
+        Con `budget_ms` el lookahead no empieza otra jugada si, a lo que tardó
+        la anterior, se pasaría del presupuesto; la primera siempre se explora.
+        """
+        t0 = time.perf_counter()
+        rows = tuple(engine.rows)
+        width, height = engine.width, engine.height
+        scored = []
+        for rot, x, board in self.placements(engine, rows, engine.pid, engine.x, engine.y, engine.rot):
+            score, cleared = self.evaluate(board, width, height)
+            scored.append((score, rot, x, board, cleared))
+        best = None
+        if scored:
+            if self.lookahead:
+                scored.sort(key=lambda s: s[0], reverse=True)
+                best_value = None
+                last = 0.0
+                for score, rot, x, board, cleared in scored[:self.top_k]:
+                    t1 = time.perf_counter()
+                    if best is not None and budget_ms is not None and (t1 - t0 + last) * 1000 > budget_ms:
+                        self.cut += 1
+                        break
+                    lines = height - sum(1 for r in board if r != (1 << width) - 1)
+                    value = self.weights["lines"] * lines + self._best_reply(engine, cleared)
+                    if best_value is None or value > best_value:
+                        best_value, best = value, (rot, x)
+                    last = time.perf_counter() - t1
+            else:
+                best = max(scored, key=lambda s: s[0])[1:3]
+        self.decisions += 1
+        ms = (time.perf_counter() - t0) * 1000
+        self.decision_ms.append(ms)
+        if ms > self.worst_ms:
+            self.worst_ms = ms
+        return best
+
+    def clear_times(self):
+        """Empieza de cero las mediciones (tiempos, peor caso y cortes)."""
+        self.decision_ms.clear()
+        self.worst_ms = 0.0
+        self.cut = 0
+
+    # ---------------------------
+    # Ejecución
+    # ---------------------------
+    def next_action(self, engine, budget_ms=None):
+        """Próxima acción para llevar la pieza activa a la jugada elegida."""
+        if self._placed != engine.placed:
+            self._placed = engine.placed
+            self._target = self.best_placement(engine, budget_ms)
+            self._actions = 0
+        self._actions += 1
+        target = self._target
+        # sin jugada o sin avanzar (p. ej. una rotación que no entra): soltar
+        if target is None or self._actions > len(engine.footprints[engine.pid]) + engine.width + 2:
+            return DROP
+        rot, x = target
+        if engine.rot != rot:
+            return ROTATE
+        if engine.x < x:
+            return RIGHT
+        if engine.x > x:
+            return LEFT
+        return DROP
+
+    def play_piece(self, engine, budget_ms=None):
+        """Lleva la pieza activa a su lugar y la suelta (sin interfaz)."""
+        placed = engine.placed
+        while not engine.over and engine.placed == placed:
+            engine.step(self.next_action(engine, budget_ms))
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Bot de Tetris sin interfaz")
+    ap.add_argument("--games", type=int, default=3)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--pieces", type=int, default=2000, help="tope de piezas por partida")
+    ap.add_argument("--lookahead", action="store_true", help="considerar la pieza siguiente")
+    ap.add_argument("--config", help="usar los parámetros de este Tetris.txt")
+    ap.add_argument("--budget-ms", type=float, help="tiempo máximo por decisión (como en la interfaz)")
+    args = ap.parse_args(argv)
+
+    if args.config:
+        from analisador import load_config
+        from gameconfig import tetris_settings
+        settings = tetris_settings(load_config(args.config))
+        engine_args = settings.engine_args()
+        tick_ms = settings.tick_ms
+    else:
+        engine_args = {}
+        tick_ms = None
+
+    rng = random.Random(args.seed)
+    bot = TetrisBot(lookahead=args.lookahead)
+    for game in range(args.games):
+        engine = TetrisEngine(**engine_args, seed=rng.randrange(2**32))
+        bot.reset()
+        while not engine.over and engine.placed < args.pieces:
+            bot.play_piece(engine, args.budget_ms)
+            engine.step(TICK)
+        times = sorted(bot.decision_ms)
+        line = f"partida {game}: piezas {engine.placed}  líneas {engine.lines}  puntaje {engine.score}"
+        if times:
+            p99 = times[min(len(times) - 1, int(0.99 * len(times)))]
+            # el peor caso contra el tick más corto que llegó a tener la partida
+            limit = f" / tick {tick_ms(engine.score)} ms" if tick_ms else ""
+            cut = f"  cortadas {bot.cut}" if args.budget_ms is not None else ""
+            line += (f"  decisión p50 {statistics.median(times):.2f} ms  p99 {p99:.2f} ms"
+                     f"  máx {bot.worst_ms:.2f} ms{limit}{cut}")
+        else:
+            line += "  sin decisiones"
+        print(line)
+        bot.clear_times()
+    info = bot.evaluate.cache_info()
+    print(f"caché: {info.hits} aciertos, {info.misses} fallos, {info.currsize} tableros")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,427 @@
+# ============================
+# Motor de juego sin interfaz
+# ============================
+# Reglas de Tetris y Snake separadas de Tkinter: no dibujan, no muestran
+# mensajes y no dependen de after(), así que se pueden simular tan rápido
+# como se quiera (pruebas, balanceo, bots).
+
+import random
+from array import array
+from bisect import bisect_right
+from collections import deque
+
+# acciones
+LEFT = "left"
+RIGHT = "right"
+DOWN = "down"
+UP = "up"
+DROP = "drop"
+ROTATE = "rotate"
+POWER = "power"
+TICK = "tick"
+
+# eventos que devuelve step() (se combinan como bits)
+EV_LOCK = 1          # la pieza quedó fija
+EV_LINES = 2         # se limpiaron líneas
+EV_POWER = 4         # POWER activado
+EV_POWER_USED = 8    # POWER rechazado: ya fue usado
+EV_POWER_LOCKED = 16  # POWER rechazado: puntaje insuficiente
+EV_FOOD = 32         # la serpiente comió
+EV_GAME_OVER = 64    # terminó la partida
+EV_WIN = 128         # la serpiente llenó el tablero
+
+# piezas (tetrominós) como matriz de 1/0 y su color
+TETRIS_PIECES = [
+    ([[1,1],
+      [1,1]], "yellow"),  # O
+    ([[1,1,1,1]], "cyan"),  # I
+    ([[0,1,1],
+      [1,1,0]], "green"),  # S
+    ([[1,1,0],
+      [0,1,1]], "red"),    # Z
+    ([[1,0,0],
+      [1,1,1]], "orange"), # L
+    ([[0,0,1],
+      [1,1,1]], "blue"),   # J
+    ([[0,1,0],
+      [1,1,1]], "magenta") # T
+]
+
+POWER_SCORE = 1000
+
+
+def rotate_matrix(m):
+    return [list(row) for row in zip(*m[::-1])]
+
+
+class Shape:
+    """Un estado de rotación precalculado de una pieza."""
+
+    __slots__ = ("matrix", "cells", "w", "h", "rows")
+
+    def __init__(self, matrix):
+        self.matrix = tuple(tuple(row) for row in matrix)
+        # celdas ocupadas como desplazamientos (dx, dy)
+        self.cells = tuple((px, py) for py, row in enumerate(matrix)
+                           for px, val in enumerate(row) if val)
+        self.w = len(matrix[0])
+        self.h = len(matrix)
+        # máscara de bits por fila con la columna 0 de la pieza en el bit 0
+        self.rows = tuple(sum(1 << px for px, val in enumerate(row) if val) for row in matrix)
+
+    def shifted(self, width):
+        """Máscaras de las filas ya desplazadas a cada columna x donde cabe."""
+        return [tuple(m << x for m in self.rows) for x in range(width - self.w + 1)]
+
+
+def piece_rotations(matrix):
+    """Los 4 estados de rotación (horaria) de una pieza."""
+    states = []
+    for _ in range(4):
+        states.append(Shape(matrix))
+        matrix = rotate_matrix(matrix)
+    return states
+
+
+# rotaciones de las piezas por defecto, calculadas una sola vez al importar
+TETRIS_ROTATIONS = [piece_rotations(matrix) for matrix, _ in TETRIS_PIECES]
+
+
+class TetrisEngine:
+    """Tetris sobre un bitboard: un entero por fila más un bytearray de colores.
+
+    `rows[y]` tiene el bit x encendido si la celda (x, y) está ocupada y
+    `colors[y*width + x]` guarda el índice del color (0 = vacía) en
+    `color_names`. La pieza activa es `(pid, rot)`: un índice en `pieces` y
+    su estado de rotación en `rotations[pid]`.
+    """
+
+    def __init__(self, width=10, height=20, pieces=TETRIS_PIECES, seed=None,
+                 rotations=None, lock_points=50, line_points=100):
+        self.width = width
+        self.height = height
+        self.full = (1 << width) - 1
+        self.pieces = pieces
+        self.lock_points = lock_points
+        self.line_points = line_points
+        self.color_names = [0]
+        for _, name in pieces:
+            if name not in self.color_names:
+                self.color_names.append(name)
+        self._piece_ids = range(len(pieces))
+        if rotations is not None:
+            # estados de rotación explícitos (p. ej. las variantes de Tetris.txt)
+            self.rotations = [[Shape(m) for m in states] for states in rotations]
+        elif pieces is TETRIS_PIECES:
+            self.rotations = TETRIS_ROTATIONS
+        else:
+            self.rotations = [piece_rotations(matrix) for matrix, _ in pieces]
+        self.piece_colors = [self.color_names.index(name) for _, name in pieces]
+        # máscaras pre-desplazadas por (pieza, rotación) para este ancho
+        self.footprints = [[shape.shifted(width) for shape in rots] for rots in self.rotations]
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        self.rng = random.Random(seed)
+        self.rows = [0] * self.height
+        self.colors = bytearray(self.width * self.height)
+        self.score = 0
+        self.lines = 0
+        self.placed = 0
+        self.power_used = False
+        self.over = False
+        self.spawn()
+
+    @property
+    def board(self):
+        """Tablero como lista de filas con nombres de color (0 = vacía)."""
+        names = self.color_names
+        w = self.width
+        return [[names[c] for c in self.colors[y*w:(y+1)*w]] for y in range(self.height)]
+
+    @property
+    def shape(self):
+        return self.rotations[self.pid][self.rot]
+
+    @property
+    def piece(self):
+        """Matriz de 1/0 de la pieza activa."""
+        return [list(row) for row in self.shape.matrix]
+
+    def spawn(self):
+        pid = self.rng.choice(self._piece_ids)
+        self.pid = pid
+        self.rot = 0
+        self.color = self.piece_colors[pid]
+        self.masks = self.footprints[pid][0]
+        self.y = 0
+        self.x = self.rng.randint(0, self.width - self.rotations[pid][0].w)
+        # ensure fit
+        if self.collides(self.x, self.y, self.masks):
+            self.over = True
+
+    def collides(self, nx, ny, masks):
+        if nx < 0 or nx >= len(masks) or ny < 0:
+            return True
+        shifted = masks[nx]
+        if ny + len(shifted) > self.height:
+            return True
+        rows = self.rows
+        for i, m in enumerate(shifted):
+            if rows[ny+i] & m:
+                return True
+        return False
+
+    def lock(self):
+        rows = self.rows
+        colors = self.colors
+        w = self.width
+        for i, m in enumerate(self.masks[self.x]):
+            y = self.y + i
+            rows[y] |= m
+            # colores: recorrer los bits encendidos de la fila
+            base = y * w
+            while m:
+                low = m & -m
+                colors[base + low.bit_length() - 1] = self.color
+                m ^= low
+        events = EV_LOCK
+        if self.clear_lines():
+            events |= EV_LINES
+        self.score += self.lock_points
+        self.placed += 1
+        self.spawn()
+        return events
+
+    def clear_lines(self):
+        full = self.full
+        rows = self.rows
+        if full not in rows:
+            return 0
+        w = self.width
+        keep = [y for y, r in enumerate(rows) if r != full]
+        removed = self.height - len(keep)
+        colors = self.colors
+        self.rows = [0] * removed + [rows[y] for y in keep]
+        self.colors = bytearray(removed * w) + b"".join(colors[y*w:(y+1)*w] for y in keep)
+        self.score += removed*self.line_points
+        self.lines += removed
+        return removed
+
+    def cells(self):
+        """Celdas (x, y) ocupadas por la pieza activa."""
+        x = self.x
+        y = self.y
+        return [(x+px, y+py) for px, py in self.shape.cells]
+
+    def step(self, action=TICK):
+        """Aplica una acción (TICK = gravedad) y devuelve los eventos."""
+        if self.over:
+            return 0
+        events = 0
+        masks = self.masks
+        if action == TICK or action == DOWN:
+            if not self.collides(self.x, self.y+1, masks):
+                self.y += 1
+            elif action == TICK:
+                # cannot move down -> lock
+                events = self.lock()
+        elif action == LEFT:
+            if not self.collides(self.x-1, self.y, masks):
+                self.x -= 1
+        elif action == RIGHT:
+            if not self.collides(self.x+1, self.y, masks):
+                self.x += 1
+        elif action == DROP:
+            # impulso: drop until collision
+            while not self.collides(self.x, self.y+1, masks):
+                self.y += 1
+            events = self.lock()
+        elif action == POWER:
+            if self.score >= POWER_SCORE and not self.power_used:
+                self.rows = [0] * self.height
+                self.colors = bytearray(self.width * self.height)
+                self.power_used = True
+                events = EV_POWER
+            elif self.power_used:
+                events = EV_POWER_USED
+            else:
+                events = EV_POWER_LOCKED
+        elif action == ROTATE:
+            # Rotación con validación de bordes
+            rot = (self.rot + 1) % len(self.footprints[self.pid])
+            newm = self.footprints[self.pid][rot]
+            # Si choca, intenta corregir moviendo 1 a la izquierda o derecha
+            for dx in (0, -1, 1):
+                if not self.collides(self.x+dx, self.y, newm):
+                    self.x += dx
+                    self.rot = rot
+                    self.masks = newm
+                    break
+            # Si no se pudo corregir → no se rota (validación)
+        if self.over:
+            events |= EV_GAME_OVER
+        return events
+
+    def state(self):
+        return {
+            "board": self.board,
+            "piece": self.piece,
+            "pid": self.pid,
+            "rot": self.rot,
+            "color": self.color_names[self.color],
+            "x": self.x,
+            "y": self.y,
+            "score": self.score,
+            "lines": self.lines,
+            "placed": self.placed,
+            "power_used": self.power_used,
+            "over": self.over,
+        }
+
+
+# direcciones de Snake y su opuesta
+DIRECTIONS = {UP: (0, -1), DOWN: (0, 1), LEFT: (-1, 0), RIGHT: (1, 0)}
+
+# tipos de comida: (puntos, crecimiento, peso al sortear)
+SNAKE_FOODS = ((10, 1, 1.0),)
+
+
+class SnakeEngine:
+    """Snake con índice de ocupación.
+
+    El cuerpo vive en un deque (cabeza a la izquierda) y la ocupación en un
+    bytearray de cols*rows, así que chocar consigo misma es O(1). Las celdas
+    libres se mantienen en un arreglo con borrado por intercambio (`free` y
+    su posición `slot`), de modo que la comida se sortea en O(1) y un tablero
+    lleno se detecta como victoria.
+
+    `foods` son los tipos de comida (puntos, crecimiento, peso); la que
+    aparece se sortea según los pesos y queda en `food_kind`.
+    """
+
+    def __init__(self, cols=30, rows=20, seed=None, foods=SNAKE_FOODS, length=1, direction=RIGHT):
+        self.cols = cols
+        self.rows = rows
+        self.foods = foods
+        self.length = length
+        self.start_dir = DIRECTIONS[direction]
+        # pesos acumulados para sortear el tipo con bisect
+        self.food_cum = []
+        total = 0.0
+        for _, _, weight in foods:
+            total += weight
+            self.food_cum.append(total)
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        self.rng = random.Random(seed)
+        n = self.cols * self.rows
+        self.grid = bytearray(n)
+        self.free = array("i", range(n))
+        self.slot = array("i", range(n))
+        self.snake = deque()
+        self.dir = self.start_dir
+        self.score = 0
+        self.over = False
+        self.won = False
+        self.food_kind = 0
+        self.pending = 0   # segmentos que faltan por crecer
+        # cabeza al centro y el resto del cuerpo detrás, según la dirección
+        hx, hy = self.cols//2, self.rows//2
+        dx, dy = self.dir
+        for i in range(self.length):
+            x, y = hx - i*dx, hy - i*dy
+            if not (0 <= x < self.cols and 0 <= y < self.rows):
+                break
+            self.snake.append((x, y))
+            self._occupy(y*self.cols + x)
+        self.place_food()
+
+    def _occupy(self, c):
+        # borrar c de las libres intercambiándola con la última
+        free = self.free
+        slot = self.slot
+        i = slot[c]
+        last = free.pop()
+        if last != c:
+            free[i] = last
+            slot[last] = i
+        slot[c] = -1
+        self.grid[c] = 1
+
+    def _release(self, c):
+        self.slot[c] = len(self.free)
+        self.free.append(c)
+        self.grid[c] = 0
+
+    def place_food(self):
+        """Sortea la comida entre las celdas libres; False si no queda ninguna."""
+        if not self.free:
+            self.food = None
+            return False
+        c = self.free[self.rng.randrange(len(self.free))]
+        self.food = (c % self.cols, c // self.cols)
+        if len(self.foods) > 1:
+            cum = self.food_cum
+            self.food_kind = min(bisect_right(cum, self.rng.random() * cum[-1]), len(cum) - 1)
+        return True
+
+    def turn(self, action):
+        """Cambia la dirección, sin permitir invertir el sentido."""
+        d = DIRECTIONS.get(action)
+        if d and self.dir != (-d[0], -d[1]):
+            self.dir = d
+
+    def step(self, action=None):
+        """Gira (si se indica una dirección) y avanza una celda."""
+        if self.over:
+            return 0
+        if action:
+            self.turn(action)
+        # compute new head
+        hx,hy = self.snake[0]
+        dx,dy = self.dir
+        nx,ny = hx+dx, hy+dy
+        # collision
+        if nx<0 or nx>=self.cols or ny<0 or ny>=self.rows or self.grid[ny*self.cols + nx]:
+            self.over = True
+            return EV_GAME_OVER
+        # move
+        head = (nx,ny)
+        self.snake.appendleft(head)
+        self._occupy(ny*self.cols + nx)
+        if head==self.food:
+            points, growth = self.foods[self.food_kind][:2]
+            self.score += points
+            # comer ya alarga en 1 (no se quita la cola); crecer más se
+            # cobra en los próximos pasos y encoger quita cola ahora
+            if growth > 1:
+                self.pending += growth - 1
+            for _ in range(1 - growth):
+                if len(self.snake) > 1:
+                    tx, ty = self.snake.pop()
+                    self._release(ty*self.cols + tx)
+            if not self.place_food():
+                # no quedan celdas libres: tablero lleno
+                self.won = True
+                self.over = True
+                return EV_FOOD | EV_WIN
+            return EV_FOOD
+        if self.pending:
+            self.pending -= 1
+            return 0
+        tx, ty = self.snake.pop()
+        self._release(ty*self.cols + tx)
+        return 0
+
+    def state(self):
+        return {
+            "snake": list(self.snake),
+            "dir": self.dir,
+            "food": self.food,
+            "food_kind": self.food_kind,
+            "score": self.score,
+            "over": self.over,
+            "won": self.won,
+        }
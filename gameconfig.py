@@ -0,0 +1,235 @@
+# ============================
+# Parámetros de juego desde la configuración
+# ============================
+# Carga Tetris.txt y Snake.txt una sola vez (con la caché de
+# analisador.load_config), los valida contra un esquema simple y precalcula
+# las tablas que usa el runtime: intervalos de tick por nivel, piezas de
+# Tetris y comidas de Snake (puntos, crecimiento y peso). Los puntajes de
+# Tetris siguen siendo los del motor: Tetris.txt no dice a qué jugada
+# corresponden sus puntos_espaciales.
+
+from analisador import load_config
+from engine import TETRIS_PIECES, SNAKE_FOODS, LEFT, RIGHT, UP, DOWN
+
+MIN_TICK_MS = 60     # ningún nivel cae más rápido que esto
+MAX_LEVELS = 30
+
+# colores de la configuración -> hex (normalizados en minúsculas y con "_")
+CONFIG_COLORS = {
+    "blanco": "#ECEFF1", "dorado": "#FFD54A", "morado": "#CE93D8",
+    "verde_neon": "#76FF03", "rojo_fuego": "#FF5722", "negro_ardiente": "#8D6E63",
+    "rojo": "#ff3333", "amarillo": "#ffd600", "verde": "#66ff66",
+}
+
+SNAKE_DIRECTIONS = {"derecha": RIGHT, "izquierda": LEFT, "arriba": UP, "abajo": DOWN}
+
+NUMBER = (int, float)
+
+# clave: (tipo, mínimo, máximo, requerida)
+TETRIS_SCHEMA = {
+    "ancho": (int, 4, 60, True),
+    "alto": (int, 4, 100, True),
+    "energia_descendente": (NUMBER, 0.01, 10, False),
+    "regla_niveles_energia_descendente": (dict, None, None, False),
+    "fragmento_galacticos": (list, None, None, False),
+}
+TETRIS_LEVELS_SCHEMA = {
+    "gemas_por_nivel": (int, 1, None, True),
+    "velocidad_expancion": (NUMBER, 1, 10, True),
+}
+SNAKE_SCHEMA = {
+    "ancho": (int, 4, 500, True),
+    "alto": (int, 4, 500, True),
+    "velocidad": (NUMBER, 0.1, 100, False),
+    "longitud_inicial": (int, 1, None, False),
+    "dirección_inicial": (str, None, None, False),
+    "comidas": (list, None, None, False),
+    "regla_velocidad": (dict, None, None, False),
+}
+SNAKE_SPEED_SCHEMA = {
+    "umbral_puntos": (int, 1, None, True),
+    "multiplicador_velocidad": (NUMBER, 1, 10, True),
+}
+FOOD_SCHEMA = {
+    "nombre": (str, None, None, True),
+    "puntos": (int, None, None, True),
+    "incremento": (int, -10, 10, False),
+    "probabilidad": (NUMBER, 0, 1, False),
+    "color": (str, None, None, False),
+}
+
+
+class ConfigError(ValueError):
+    pass
+
+
+def validate(config, schema, where):
+    """Lanza ConfigError con todos los problemas encontrados."""
+    errors = []
+    if not isinstance(config, dict):
+        raise ConfigError(f"{where}: se esperaba un bloque {{ }}")
+    for key, (kind, lo, hi, required) in schema.items():
+        if key not in config:
+            if required:
+                errors.append(f"{where}: falta '{key}'")
+            continue
+        value = config[key]
+        if not isinstance(value, kind) or isinstance(value, bool):
+            errors.append(f"{where}: '{key}' tiene un tipo inválido ({value!r})")
+        elif lo is not None and value < lo or hi is not None and value > hi:
+            errors.append(f"{where}: '{key}' fuera de rango ({value!r})")
+    if errors:
+        raise ConfigError("\n".join(errors))
+
+
+def color_key(name):
+    return str(name).strip().lower().replace(" ", "_")
+
+
+def level_table(base_ms, factor, levels=MAX_LEVELS):
+    """Intervalo en ms de cada nivel: base / factor**nivel, con tope inferior."""
+    table = []
+    for level in range(levels):
+        ms = max(MIN_TICK_MS, int(round(base_ms / factor ** level)))
+        table.append(ms)
+        if ms == MIN_TICK_MS:
+            break
+    return tuple(table)
+
+
+def trim_matrix(matrix):
+    """Recorta filas y columnas vacías alrededor de una variante."""
+    rows = [y for y, row in enumerate(matrix) if any(row)]
+    cols = [x for x in range(len(matrix[0])) if any(row[x] for row in matrix)]
+    return [[1 if matrix[y][x] else 0 for x in cols] for y in rows]
+
+
+class TetrisSettings:
+    """Parámetros de Tetris; sin argumentos son los valores por defecto."""
+
+    def __init__(self, width=10, height=20, pieces=TETRIS_PIECES, rotations=None,
+                 base_ms=500, level_points=0, speedup=1.0, lock_points=50, line_points=100,
+                 colors=None):
+        self.width = width
+        self.height = height
+        self.pieces = pieces
+        self.rotations = rotations
+        self.lock_points = lock_points
+        self.line_points = line_points
+        self.colors = colors or {}   # nombre de color -> hex para el render
+        self.level_points = level_points
+        self.level_ms = level_table(base_ms, speedup) if level_points else (base_ms,)
+
+    def tick_ms(self, score):
+        if not self.level_points:
+            return self.level_ms[0]
+        return self.level_ms[min(score // self.level_points, len(self.level_ms) - 1)]
+
+    def engine_args(self):
+        return dict(width=self.width, height=self.height, pieces=self.pieces,
+                    rotations=self.rotations, lock_points=self.lock_points,
+                    line_points=self.line_points)
+
+
+class SnakeSettings:
+    """Parámetros de Snake; sin argumentos son los valores por defecto."""
+
+    def __init__(self, cols=30, rows=20, base_ms=120, speed_points=0, speedup=1.0,
+                 foods=SNAKE_FOODS, food_colors=("#ff3333",), length=1, direction=RIGHT):
+        self.cols = cols
+        self.rows = rows
+        self.foods = foods                 # (puntos, crecimiento, peso)
+        self.food_colors = food_colors
+        self.length = length
+        self.direction = direction
+        self.speed_points = speed_points
+        self.level_ms = level_table(base_ms, speedup) if speed_points else (base_ms,)
+
+    def tick_ms(self, score):
+        if not self.speed_points:
+            return self.level_ms[0]
+        return self.level_ms[min(max(score, 0) // self.speed_points, len(self.level_ms) - 1)]
+
+    def engine_args(self):
+        return dict(cols=self.cols, rows=self.rows, foods=self.foods,
+                    length=self.length, direction=self.direction)
+
+
+def tetris_settings(config):
+    validate(config, TETRIS_SCHEMA, "Tetris")
+    base_ms = int(round(config.get("energia_descendente", 0.5) * 1000))
+
+    level_points, speedup = 0, 1.0
+    levels = config.get("regla_niveles_energia_descendente")
+    if levels and levels.get("aumento_energia_descendente", "si") == "si":
+        validate(levels, TETRIS_LEVELS_SCHEMA, "regla_niveles_energia_descendente")
+        level_points = levels["gemas_por_nivel"]
+        speedup = levels["velocidad_expancion"]
+
+    pieces, rotations, colors = TETRIS_PIECES, None, {}
+    names = config.get("fragmento_galacticos")
+    if names:
+        pieces, rotations = [], []
+        for name in names:
+            frag = config.get(name)
+            validate(frag, {"variantes": (list, None, None, True)}, name)
+            variants = []
+            for matrix in frag["variantes"]:
+                if (not matrix or not all(isinstance(row, list) and row for row in matrix)
+                        or len({len(row) for row in matrix}) != 1 or not any(map(any, matrix))):
+                    raise ConfigError(f"{name}: variante inválida {matrix!r}")
+                variants.append(trim_matrix(matrix))
+            if not variants:
+                raise ConfigError(f"{name}: no tiene variantes")
+            color = color_key(frag.get("color", name))
+            colors[color] = CONFIG_COLORS.get(color, "#FFFFFF")
+            pieces.append((variants[0], color))
+            rotations.append(variants)
+
+    settings = TetrisSettings(config["ancho"], config["alto"], pieces, rotations,
+                              base_ms, level_points, speedup, colors=colors)
+    if any(shape_w > settings.width for variants in (rotations or [])
+           for shape_w in (len(m[0]) for m in variants)):
+        raise ConfigError("Tetris: hay fragmentos más anchos que el tablero")
+    return settings
+
+
+def snake_settings(config):
+    validate(config, SNAKE_SCHEMA, "Snake")
+    # velocidad en cuadros por segundo
+    base_ms = int(round(1000 / config["velocidad"])) if "velocidad" in config else 120
+
+    speed_points, speedup = 0, 1.0
+    rule = config.get("regla_velocidad")
+    if rule:
+        validate(rule, SNAKE_SPEED_SCHEMA, "regla_velocidad")
+        speed_points = rule["umbral_puntos"]
+        speedup = rule["multiplicador_velocidad"]
+
+    foods, colors = SNAKE_FOODS, ("#ff3333",)
+    comidas = config.get("comidas")
+    if comidas:
+        for i, food in enumerate(comidas):
+            validate(food, FOOD_SCHEMA, f"comidas[{i}]")
+        # las comidas sin probabilidad se reparten lo que dejan las demás
+        fixed = sum(food["probabilidad"] for food in comidas if "probabilidad" in food)
+        rest = [food for food in comidas if "probabilidad" not in food]
+        if fixed > 1 or (not rest and fixed <= 0):
+            raise ConfigError("comidas: las probabilidades no suman un valor válido")
+        share = (1 - fixed) / len(rest) if rest else 0.0
+        foods = tuple((food["puntos"], food.get("incremento", 1), food.get("probabilidad", share))
+                      for food in comidas)
+        colors = tuple(CONFIG_COLORS.get(color_key(food.get("color", "rojo")), "#ff3333")
+                       for food in comidas)
+
+    direction = SNAKE_DIRECTIONS.get(color_key(config.get("dirección_inicial", "derecha")))
+    if direction is None:
+        raise ConfigError(f"Snake: dirección inicial inválida {config['dirección_inicial']!r}")
+
+    return SnakeSettings(config["ancho"], config["alto"], base_ms, speed_points, speedup,
+                         foods, colors, config.get("longitud_inicial", 1), direction)
+
+
+def load_settings(tetris_path="Tetris.txt", snake_path="Snake.txt"):
+    """(TetrisSettings, SnakeSettings) desde los archivos de configuración."""
+    return tetris_settings(load_config(tetris_path)), snake_settings(load_config(snake_path))
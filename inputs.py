@@ -0,0 +1,73 @@
+# ============================
+# Cola de entrada
+# ============================
+# Las teclas no tocan el motor directamente: se encolan y el bucle del juego
+# las consume. Tetris aplica la cola una vez por frame, descartando lo que ya
+# no puede tener efecto; Snake aplica como mucho un giro por paso de lógica,
+# validado contra la dirección en que realmente se movió.
+
+from collections import deque
+
+from engine import DIRECTIONS, DROP, POWER
+
+INPUT_QUEUE_MAX = 16
+
+
+class InputQueue:
+    """Cola acotada de acciones; si se llena se descartan las más viejas."""
+
+    def __init__(self, maxlen=INPUT_QUEUE_MAX):
+        self.items = deque(maxlen=maxlen)
+        self.dropped = 0
+
+    def __len__(self):
+        return len(self.items)
+
+    def push(self, action):
+        if len(self.items) == self.items.maxlen:
+            self.dropped += 1
+        self.items.append(action)
+
+    def popleft(self):
+        return self.items.popleft()
+
+    def drain(self):
+        """Todas las acciones pendientes, en orden, vaciando la cola."""
+        items = list(self.items)
+        self.items.clear()
+        return items
+
+    def clear(self):
+        self.items.clear()
+
+
+def coalesce_tetris(actions):
+    """Compacta las acciones de un frame de Tetris.
+
+    Los movimientos se aplican todos y en orden: izquierda + derecha no se
+    anulan, porque contra una pared o un bloque el primero puede no moverse.
+    POWER cuenta una sola vez y nada después de un DROP se aplica: era para
+    la pieza que acaba de fijarse.
+    """
+    out = []
+    for action in actions:
+        if action == POWER and POWER in out:
+            continue
+        out.append(action)
+        if action == DROP:
+            return out
+    return out
+
+
+def next_snake_turn(queue, direction):
+    """Saca de la cola el primer giro que cambia `direction` sin invertirla.
+
+    `direction` es (dx, dy) del último paso; los giros redundantes (misma
+    dirección) o imposibles (sentido contrario) se descartan.
+    """
+    while queue:
+        action = queue.popleft()
+        d = DIRECTIONS.get(action)
+        if d and d != direction and d != (-direction[0], -direction[1]):
+            return action
+    return None
@@ -0,0 +1,167 @@
+# ============================
+# Medición de tiempos por frame
+# ============================
+# Histogramas móviles del tiempo de lógica, de render y del retraso de cada
+# tick respecto a su hora programada (jitter). Opcionalmente: eventos en
+# formato Chrome trace (Tracer) y una sesión de cProfile (Profiler).
+
+import json
+import os
+import time
+from collections import deque
+
+# límites superiores (ms) de los cubos del histograma; el último es "más"
+HIST_BUCKETS_MS = (1, 2, 4, 8, 16, 33, 66, 133, 266)
+
+
+class RollingHistogram:
+    """Guarda las últimas `size` muestras (en ms)."""
+
+    def __init__(self, size=600):
+        self.samples = deque(maxlen=size)
+
+    def add(self, ms):
+        self.samples.append(ms)
+
+    def percentile(self, p):
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        k = min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))
+        return ordered[k]
+
+    def histogram(self):
+        counts = [0] * (len(HIST_BUCKETS_MS) + 1)
+        for ms in self.samples:
+            for i, limit in enumerate(HIST_BUCKETS_MS):
+                if ms <= limit:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+        return counts
+
+    def summary(self):
+        n = len(self.samples)
+        return {
+            "n": n,
+            "mean": sum(self.samples) / n if n else 0.0,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": max(self.samples) if n else 0.0,
+            "buckets_ms": list(HIST_BUCKETS_MS),
+            "histogram": self.histogram(),
+        }
+
+
+class FrameStats:
+    """Estadísticas del bucle de juego: lógica, render y jitter de los ticks."""
+
+    def __init__(self, size=600):
+        self.logic = RollingHistogram(size)
+        self.render = RollingHistogram(size)
+        self.jitter = RollingHistogram(size)
+        self.keys = RollingHistogram(size)
+        self.ticks = 0
+        self.frames = 0
+        self.dropped = 0
+        self.items = 0                       # items vivos en el canvas (última muestra)
+        self.frame_times = deque(maxlen=120)
+
+    def frame(self, now):
+        self.frames += 1
+        self.frame_times.append(now)
+
+    @property
+    def fps(self):
+        times = self.frame_times
+        if len(times) < 2 or times[-1] == times[0]:
+            return 0.0
+        return (len(times) - 1) / (times[-1] - times[0])
+
+    def summary(self):
+        return {
+            "ticks": self.ticks,
+            "frames": self.frames,
+            "dropped_ticks": self.dropped,
+            "fps": self.fps,
+            "canvas_items": self.items,
+            "logic_ms": self.logic.summary(),
+            "render_ms": self.render.summary(),
+            "jitter_ms": self.jitter.summary(),
+            "key_ms": self.keys.summary(),
+        }
+
+    def overlay_text(self):
+        lines = [f"fps {self.fps:5.1f}  items {self.items}",
+                 f"ticks {self.ticks}  frames {self.frames}  descartados {self.dropped}"]
+        for name, hist in (("lógica", self.logic), ("render", self.render),
+                           ("jitter", self.jitter), ("teclas", self.keys)):
+            lines.append(f"{name:7} p50 {hist.percentile(50):6.2f}  p99 {hist.percentile(99):6.2f} ms")
+        return "\n".join(lines)
+
+    def dump(self, path):
+        data = self.summary()
+        data["time"] = time.time()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=4)
+        return path
+
+
+class Tracer:
+    """Eventos en formato Chrome trace (chrome://tracing o ui.perfetto.dev).
+
+    Los tiempos son de time.perf_counter(); se guardan en µs desde que se
+    creó el tracer. Solo se conservan los últimos `max_events`.
+    """
+
+    def __init__(self, max_events=500000):
+        self.events = deque(maxlen=max_events)
+        self.t0 = time.perf_counter()
+        self.pid = os.getpid()
+
+    def complete(self, name, start, end, cat="game", **args):
+        """Un tramo con duración (evento "X")."""
+        event = {"name": name, "cat": cat, "ph": "X", "pid": self.pid, "tid": 0,
+                 "ts": (start - self.t0) * 1e6, "dur": (end - start) * 1e6}
+        if args:
+            event["args"] = args
+        self.events.append(event)
+
+    def counter(self, name, now, **values):
+        """Valores que se grafican en el tiempo (evento "C")."""
+        self.events.append({"name": name, "ph": "C", "pid": self.pid, "tid": 0,
+                            "ts": (now - self.t0) * 1e6, "args": values})
+
+    def instant(self, name, now, **args):
+        """Una marca puntual (evento "i")."""
+        self.events.append({"name": name, "ph": "i", "s": "g", "pid": self.pid, "tid": 0,
+                            "ts": (now - self.t0) * 1e6, "args": args})
+
+    def dump(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": list(self.events), "displayTimeUnit": "ms"}, f)
+        return path
+
+
+class Profiler:
+    """Sesión de cProfile que se guarda en `path` (para pstats o snakeviz)."""
+
+    def __init__(self, path):
+        import cProfile
+        self.path = path
+        self.profile = cProfile.Profile()
+
+    def start(self):
+        self.profile.enable()
+
+    def stop(self, top=15):
+        """Detiene, guarda el .prof y devuelve las `top` funciones más costosas."""
+        import io
+        import pstats
+        self.profile.disable()
+        self.profile.dump_stats(self.path)
+        out = io.StringIO()
+        pstats.Stats(self.profile, stream=out).sort_stats("cumulative").print_stats(top)
+        return out.getvalue()
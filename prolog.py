@@ -0,0 +1,367 @@
+# ============================
+# Base de conocimiento estilo Prolog
+# ============================
+# Carga hechos como `regla(meteorito, fuerza_explosion, 3).` (Tetris_prolog.txt)
+# y responde consultas con variables:
+#
+#   kb = KnowledgeBase.load("Tetris_prolog.txt")
+#   kb.query("regla", "meteorito", Var, Var)       # [("fragmento", "meteorito"), ...]
+#   kb.value("regla", "meteorito", "fuerza_explosion", Var)   # 3
+#
+# Cada predicado (nombre, aridad) se indexa por su primer argumento con un
+# diccionario, así que una consulta con el primer argumento conocido no
+# recorre los demás hechos. Con `add_index` se agregan índices por varias
+# posiciones (p. ej. (0, 1) para regla/3), y la consulta usa el índice que
+# cubra más argumentos conocidos.
+#
+#   python prolog.py query regla meteorito X Y
+#   python prolog.py compare Tetris_prolog.txt Tetris.txt
+
+import argparse
+import re
+import sys
+
+# Un patrón con grupos con nombre que consume espacios y comentarios (% hasta
+# el fin de línea) antes de cada token; a diferencia de analisador.TOKEN_RE
+# acá hace falta el Match de cada token (posición para los errores, ERROR/END)
+TOKEN_RE = re.compile(
+    r"(?:\s+|%[^\n]*)*(?:"
+    r"'(?P<QUOTED>(?:[^'\\]|\\.|'')*)'|"   # átomos entre comillas simples
+    r"(?P<NUMBER>-?\d+(?:\.\d+)?)|"
+    r"(?P<ATOM>[a-záéíóúñ][\wÁÉÍÓÚáéíóúñÑ]*)|"
+    r"(?P<VAR>[A-ZÁÉÍÓÚÑ_][\wÁÉÍÓÚáéíóúñÑ]*)|"
+    r"(?P<PUNCT>[()\[\],.])|"
+    r"(?P<ERROR>\S)|"
+    r"(?P<END>\Z))"
+)
+TOKEN_TYPES = {index: name for name, index in TOKEN_RE.groupindex.items()}
+
+
+class Var:
+    """Variable de una consulta. `Var` solo (la clase) es anónima; `Var("X")`
+    con el mismo nombre en dos posiciones exige el mismo valor."""
+
+    def __init__(self, name=None):
+        self.name = name
+
+    def __repr__(self):
+        return self.name or "_"
+
+
+def is_var(arg):
+    return arg is Var or isinstance(arg, Var)
+
+
+def _frozen(value):
+    """Listas -> tuplas (así se guardan los hechos), para comparar e indexar."""
+    if isinstance(value, list):
+        return tuple(_frozen(v) for v in value)
+    return value
+
+
+# ---------------------------
+# Lectura de hechos
+# ---------------------------
+def tokenize(source):
+    """Genera (tipo, valor, posición) para cada token; END al final."""
+    for match in TOKEN_RE.finditer(source):
+        index = match.lastindex
+        if index is None:
+            continue
+        kind = TOKEN_TYPES[index]
+        value = match[index]
+        if kind == "NUMBER":
+            value = float(value) if "." in value else int(value)
+        elif kind == "QUOTED":
+            value = value.replace("''", "'").replace("\\'", "'")
+        yield kind, value, match.start(index)
+        if kind == "END":
+            return
+
+
+class FactParser:
+    """Convierte el texto en una lista de (nombre, argumentos).
+
+    Solo hechos: átomos, números, átomos entre comillas y listas (que quedan
+    como tuplas, para poder indexarlas). Las variables y las reglas con `:-`
+    no se aceptan.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self._next = tokenize(source).__next__
+        self.current = self._next()
+
+    def _error(self, message, pos=None):
+        pos = self.current[2] if pos is None else pos
+        line = self.source.count("\n", 0, pos) + 1
+        col = pos - self.source.rfind("\n", 0, pos)
+        return SyntaxError(f"{message} (línea {line}, columna {col})")
+
+    def eat(self, kind, value=None):
+        tok = self.current
+        if tok[0] != kind or value is not None and tok[1] != value:
+            expected = value or kind
+            raise self._error(f"Se esperaba {expected}, pero se encontró {tok[1] or tok[0]!r}")
+        self.current = self._next()
+        return tok[1]
+
+    def _is(self, value):
+        return self.current[0] == "PUNCT" and self.current[1] == value
+
+    def parse(self):
+        facts = []
+        while self.current[0] != "END":
+            facts.append(self.parse_fact())
+        return facts
+
+    def parse_fact(self):
+        name = self.eat("ATOM")
+        args = ()
+        if self._is("("):
+            self.eat("PUNCT", "(")
+            args = self.parse_items(")")
+        self.eat("PUNCT", ".")
+        return name, args
+
+    def parse_items(self, close):
+        items = []
+        while not self._is(close):
+            items.append(self.parse_term())
+            if not self._is(close):
+                self.eat("PUNCT", ",")
+        self.eat("PUNCT", close)
+        return tuple(items)
+
+    def parse_term(self):
+        kind, value, pos = self.current
+        if kind in ("ATOM", "QUOTED", "NUMBER"):
+            self.current = self._next()
+            return value
+        if kind == "PUNCT" and value == "[":
+            self.eat("PUNCT", "[")
+            return self.parse_items("]")
+        if kind == "VAR":
+            raise self._error(f"Variable {value} en un hecho (solo se aceptan hechos)", pos)
+        raise self._error(f"Término inesperado {value!r}", pos)
+
+
+# ---------------------------
+# Base de conocimiento
+# ---------------------------
+class KnowledgeBase:
+    """Hechos agrupados por (nombre, aridad) con índices por hash."""
+
+    def __init__(self, facts=()):
+        self.facts = {}      # (nombre, aridad) -> [argumentos, ...] en orden
+        self.first = {}      # (nombre, aridad) -> {primer argumento: [argumentos, ...]}
+        self.indexes = {}    # (nombre, aridad) -> {posiciones: {valores: [argumentos, ...]}}
+        for name, args in facts:
+            self.add(name, args)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            return cls.parse(f.read())
+
+    @classmethod
+    def parse(cls, source):
+        return cls(FactParser(source).parse())
+
+    def __len__(self):
+        return sum(len(facts) for facts in self.facts.values())
+
+    def add(self, name, args):
+        args = tuple(args)
+        key = (name, len(args))
+        self.facts.setdefault(key, []).append(args)
+        if args:
+            self.first.setdefault(key, {}).setdefault(args[0], []).append(args)
+        for positions, index in self.indexes.get(key, {}).items():
+            index.setdefault(tuple(args[p] for p in positions), []).append(args)
+
+    def add_index(self, name, arity, positions):
+        """Índice por los argumentos en `positions` (p. ej. (0, 1))."""
+        positions = tuple(sorted(positions))
+        if any(not 0 <= p < arity for p in positions):
+            raise ValueError(f"{name}/{arity} no tiene las posiciones {positions}")
+        index = {}
+        for args in self.facts.get((name, arity), ()):
+            index.setdefault(tuple(args[p] for p in positions), []).append(args)
+        self.indexes.setdefault((name, arity), {})[positions] = index
+
+    def _candidates(self, key, pattern):
+        """Hechos que pueden coincidir, usando el mejor índice disponible."""
+        bound = {p for p, arg in enumerate(pattern) if not is_var(arg)}
+        best = None
+        for positions in self.indexes.get(key, ()):
+            if bound.issuperset(positions) and (best is None or len(positions) > len(best)):
+                best = positions
+        if best:
+            return self.indexes[key][best].get(tuple(pattern[p] for p in best), ()), bound - set(best)
+        if 0 in bound:
+            return self.first.get(key, {}).get(pattern[0], ()), bound - {0}
+        return self.facts.get(key, ()), bound
+
+    def match(self, name, *pattern):
+        """Argumentos completos de cada hecho que coincide con `pattern`."""
+        key = (name, len(pattern))
+        pattern = tuple(_frozen(arg) for arg in pattern)
+        candidates, pending = self._candidates(key, pattern)
+        named = {}
+        for p, arg in enumerate(pattern):
+            if isinstance(arg, Var) and arg.name:
+                named.setdefault(arg.name, []).append(p)
+        repeated = [ps for ps in named.values() if len(ps) > 1]
+        out = []
+        for args in candidates:
+            if any(args[p] != pattern[p] for p in pending):
+                continue
+            if any(len({args[p] for p in ps}) > 1 for ps in repeated):
+                continue
+            out.append(args)
+        return out
+
+    def query(self, name, *pattern):
+        """Valores de las variables de `pattern` (una tupla por hecho)."""
+        slots = [p for p, arg in enumerate(pattern) if is_var(arg)]
+        return [tuple(args[p] for p in slots) for args in self.match(name, *pattern)]
+
+    def value(self, name, *pattern, default=None):
+        """Valor de la única variable de `pattern` en el primer hecho, o `default`."""
+        slots = [p for p, arg in enumerate(pattern) if is_var(arg)]
+        if len(slots) != 1:
+            raise ValueError("value() necesita exactamente una variable")
+        found = self.match(name, *pattern)
+        return found[0][slots[0]] if found else default
+
+
+# ---------------------------
+# Equivalencia con la configuración de Tetris.txt
+# ---------------------------
+# juego(clave, valor) -> clave de Tetris.txt
+GAME_KEYS = {"nombre": "nombre_juego", "version": "version",
+             "energia_descendente_inicial": "energia_descendente"}
+
+
+def _plain(value):
+    """Tuplas -> listas (como las deja analisador.Parser)."""
+    if isinstance(value, tuple):
+        return [_plain(v) for v in value]
+    return value
+
+
+def tetris_config(kb):
+    """La configuración con la forma de load_config("Tetris.txt").
+
+    Devuelve (config, hechos sin equivalente en Tetris.txt).
+    """
+    config = {}
+    unmapped = []
+    for (name, arity), facts in kb.facts.items():
+        for args in facts:
+            if name == "juego" and arity == 2:
+                config[GAME_KEYS.get(args[0], args[0])] = args[1]
+            elif name == "tablero" and arity == 2:
+                config[args[0]] = args[1]
+            elif name == "regla" and arity == 3:
+                config.setdefault(f"regla_{args[0]}", {})[args[1]] = _plain(args[2])
+            elif name == "control" and arity == 2:
+                config.setdefault("controles", {})[args[0]] = args[1]
+            elif name == "fragmento" and arity == 3:
+                config[f"fragmento_{args[0]}"] = {"color": args[1], "variantes": _plain(args[2])}
+            elif name == "fragmentos_disponibles" and arity == 1:
+                config["fragmento_galacticos"] = [f"fragmento_{n}" for n in args[0]]
+            else:
+                unmapped.append((name, args))
+    if "fragmento_galacticos" not in config:
+        # sin lista explícita: todos los fragmentos, en el orden del archivo
+        config["fragmento_galacticos"] = [f"fragmento_{args[0]}" for args in kb.facts.get(("fragmento", 3), ())]
+    return config, unmapped
+
+
+def _norm(value):
+    # "negro ardiente" == 'negro_ardiente', "Morado" == morado, condición == condicion
+    if isinstance(value, str):
+        value = value.lower().replace(" ", "_")
+        return value.translate(str.maketrans("áéíóú", "aeiou"))
+    if isinstance(value, list):
+        return tuple(_norm(v) for v in value)
+    return value
+
+
+def rule_set(config):
+    """Conjunto de (sección, clave, valor) normalizados de una configuración."""
+    rules = set()
+    for key, value in config.items():
+        if isinstance(value, dict):
+            for k, v in value.items():
+                rules.add((_norm(key), _norm(k), _norm(v)))
+        else:
+            rules.add(("", _norm(key), _norm(value)))
+    return rules
+
+
+def compare(prolog_path, dsl_path):
+    """(reglas solo en Prolog, reglas solo en el DSL, hechos sin equivalente, ajustes iguales)."""
+    from analisador import load_config
+    from gameconfig import tetris_settings, ConfigError
+
+    kb = KnowledgeBase.load(prolog_path)
+    from_kb, unmapped = tetris_config(kb)
+    from_dsl = load_config(dsl_path)
+    a, b = rule_set(from_kb), rule_set(from_dsl)
+    try:
+        same = vars(tetris_settings(from_kb)) == vars(tetris_settings(from_dsl))
+    except ConfigError as e:
+        print(f"No se pudieron armar los parámetros del juego:\n{e}")
+        same = False
+    return sorted(a - b, key=repr), sorted(b - a, key=repr), unmapped, same
+
+
+def _arg(text):
+    """Argumento de la línea de comandos: Mayúscula o _ = variable, número o átomo."""
+    if text == "_":
+        return Var
+    if text[:1].isupper():
+        return Var(text)
+    try:
+        return float(text) if "." in text else int(text)
+    except ValueError:
+        return text
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Base de conocimiento de Tetris_prolog.txt")
+    sub = ap.add_subparsers(dest="comando", required=True)
+    p_query = sub.add_parser("query", help="consulta un predicado (X, Y... son variables, _ anónima)")
+    p_query.add_argument("nombre")
+    p_query.add_argument("args", nargs="*")
+    p_query.add_argument("--file", default="Tetris_prolog.txt")
+    p_cmp = sub.add_parser("compare", help="compara las reglas con las del archivo DSL")
+    p_cmp.add_argument("prolog", nargs="?", default="Tetris_prolog.txt")
+    p_cmp.add_argument("dsl", nargs="?", default="Tetris.txt")
+    args = ap.parse_args(argv)
+
+    if args.comando == "query":
+        kb = KnowledgeBase.load(args.file)
+        pattern = [_arg(a) for a in args.args]
+        for values in kb.query(args.nombre, *pattern):
+            print(", ".join(map(repr, values)) if values else "sí")
+        return 0
+
+    only_prolog, only_dsl, unmapped, same = compare(args.prolog, args.dsl)
+    for rule in only_prolog:
+        print(f"solo en {args.prolog}: {rule}")
+    for rule in only_dsl:
+        print(f"solo en {args.dsl}: {rule}")
+    for name, fact_args in unmapped:
+        print(f"sin equivalente: {name}{fact_args}")
+    print(f"parámetros del juego: {'idénticos' if same else 'DISTINTOS'}")
+    if not (only_prolog or only_dsl):
+        print("mismo conjunto de reglas")
+    return 0 if same and not (only_prolog or only_dsl) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
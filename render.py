@@ -0,0 +1,330 @@
+# ============================
+# Renderizado en modo retenido
+# ============================
+# En vez de borrar el canvas y recrear todo en cada frame, los items se crean
+# una sola vez por tamaño de tablero y luego solo se actualizan los que cambian.
+
+import time
+from collections import deque
+
+# colores de las piezas de Tetris (nombre -> hex)
+TETRIS_COLORS = {
+    "yellow": "#FFD54A", "cyan": "#4DD0E1", "green": "#AED581",
+    "red": "#EF5350", "orange": "#FF8A65", "blue": "#42A5F5", "magenta": "#CE93D8"
+}
+
+
+
+def tetris_palette(color_names, extra=None):
+    """Paleta indexable por el índice de color del motor (0 = vacía).
+
+    `extra` agrega colores (nombre -> hex), p. ej. los de Tetris.txt.
+    """
+    colors = dict(TETRIS_COLORS, **(extra or {}))
+    return [None] + [colors.get(name, "#FFFFFF") for name in color_names[1:]]
+
+
+TETRIS_BAR_H = 35   # alto de la barra de comandos (runtime lo descuenta del tablero)
+TETRIS_BAR_TEXT = (
+    "1=Izq | 2=Abajo | 3=Der | 4=Pausa | "
+    "5=Drop | 6=Power | 7=Rotar | 0=Salir"
+)
+
+
+class TetrisRenderer:
+    """Dibuja el tablero de Tetris reutilizando un pool fijo de rectángulos."""
+
+    TAG = "tetris"        # todos los items del renderer
+    BOARD_TAG = "tetris_board"  # items que se mueven junto con el tablero
+
+    def __init__(self, canvas, palette=None):
+        self.canvas = canvas
+        self.palette = palette  # color -> hex, indexable con los valores de draw()
+        self.reset()
+
+    def reset(self):
+        """Olvida los items creados (p. ej. tras un canvas.delete("all"))."""
+        self.size = None       # (cols, rows, cell) del pool actual
+        self.origin = None     # (x0, y0) del tablero
+        self.canvas_size = None
+        self.items = []        # un rectángulo por celda, fila por fila
+        self.shown = []        # color mostrado por celda (0 = vacía)
+        self.score_item = None
+        self.score = None
+        self.bar_items = ()
+        self.last_touched = 0
+
+    def layout(self, x0, y0, cols, rows, cell, cw, ch):
+        """Crea o reubica los items estáticos. Devuelve items tocados."""
+        cv = self.canvas
+        touched = 0
+        if self.size != (cols, rows, cell):
+            cv.delete(self.TAG)
+            self.reset()
+            self._build(x0, y0, cols, rows, cell)
+            touched += len(self.items) + cols + rows + 4
+        elif self.origin != (x0, y0):
+            # mover todo el tablero con una sola llamada
+            ox, oy = self.origin
+            cv.move(self.BOARD_TAG, x0 - ox, y0 - oy)
+            self.origin = (x0, y0)
+            touched += 1
+
+        if self.canvas_size != (cw, ch):
+            # barra de comandos inferior, usa el alto real del canvas
+            if self.bar_items:
+                rect, text = self.bar_items
+                cv.coords(rect, 0, ch - TETRIS_BAR_H, cw, ch)
+                cv.coords(text, cw // 2, ch - TETRIS_BAR_H // 2)
+            else:
+                rect = cv.create_rectangle(0, ch - TETRIS_BAR_H, cw, ch, fill="#222", outline="#444",
+                                           tags=(self.TAG,))
+                text = cv.create_text(cw // 2, ch - TETRIS_BAR_H // 2, text=TETRIS_BAR_TEXT, fill="white",
+                                      font=("Arial", 11), tags=(self.TAG,))
+                self.bar_items = (rect, text)
+            self.canvas_size = (cw, ch)
+            touched += 2
+        return touched
+
+    def _build(self, x0, y0, cols, rows, cell):
+        cv = self.canvas
+        tags = (self.TAG, self.BOARD_TAG)
+        bw = cols * cell
+        bh = rows * cell
+
+        # fondo del tablero
+        cv.create_rectangle(x0-2, y0-2, x0+bw+2, y0+bh+2, fill="#111", outline="#333", tags=tags)
+
+        # pool de celdas (ocultas mientras estén vacías)
+        items = []
+        for y in range(rows):
+            for x in range(cols):
+                cx = x0 + x*cell
+                cy = y0 + y*cell
+                items.append(cv.create_rectangle(cx+1, cy+1, cx+cell-1, cy+cell-1,
+                                                 fill="#111", outline="#111",
+                                                 state="hidden", tags=tags))
+
+        # líneas de cuadrícula (por encima de las celdas)
+        for i in range(cols+1):
+            cv.create_line(x0+i*cell, y0, x0+i*cell, y0+bh, fill="#222", tags=tags)
+        for j in range(rows+1):
+            cv.create_line(x0, y0+j*cell, x0+bw, y0+j*cell, fill="#222", tags=tags)
+
+        # puntaje a la derecha
+        self.score_item = cv.create_text(x0 + bw + 80, y0 + 20, text="", fill="white",
+                                         font=("Arial", 12), anchor="w", tags=tags)
+
+        self.items = items
+        self.shown = [0] * (cols * rows)
+        self.size = (cols, rows, cell)
+        self.origin = (x0, y0)
+
+    def draw(self, board, piece_cells, piece_color, score):
+        """Sincroniza el canvas con el estado del juego.
+
+        `board` es una secuencia plana (fila por fila) de índices de color,
+        0 si vacía; `piece_cells` son las celdas (x, y) de la pieza activa.
+        Devuelve cuántos items se tocaron en este frame.
+        """
+        cols, rows, _ = self.size
+        frame = bytearray(board)
+        for x, y in piece_cells:
+            if 0 <= x < cols and 0 <= y < rows:
+                frame[y*cols + x] = piece_color
+
+        itemconfig = self.canvas.itemconfig
+        palette = self.palette
+        items = self.items
+        shown = self.shown
+        touched = 0
+        for i, color in enumerate(frame):
+            if color != shown[i]:
+                if color:
+                    itemconfig(items[i], fill=palette[color], state="normal")
+                else:
+                    itemconfig(items[i], state="hidden")
+                shown[i] = color
+                touched += 1
+
+        if score != self.score:
+            itemconfig(self.score_item, text=f"Puntaje: {score}")
+            self.score = score
+            touched += 1
+
+        self.last_touched = touched
+        return touched
+
+
+SNAKE_HEAD = "#66ff66"
+SNAKE_BODY = "#009933"
+SNAKE_FOOD = "#ff3333"
+
+
+class SnakeRenderer:
+    """Dibuja Snake manteniendo un item del canvas por segmento.
+
+    Cada paso solo crea (o recicla) el item de la nueva cabeza y recolorea la
+    cabeza anterior, así que el costo por frame no depende del largo.
+    """
+
+    TAG = "snake"
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.reset()
+
+    def reset(self):
+        """Olvida los items creados (p. ej. tras un canvas.delete("all"))."""
+        self.size = None       # (cols, rows, cell)
+        self.origin = None     # (x0, y0)
+        self.segments = deque()  # items de los segmentos, cabeza a la izquierda
+        self.head = None
+        self.food_item = None
+        self.food = None
+        self.score_item = None
+        self.score = None
+        self.last_touched = 0
+
+    def layout(self, x0, y0, cols, rows, cell):
+        """Crea o reubica los items estáticos. Devuelve items tocados."""
+        cv = self.canvas
+        if self.size != (cols, rows, cell):
+            cv.delete(self.TAG)
+            self.reset()
+            grid_w = cols * cell
+            grid_h = rows * cell
+            cv.create_rectangle(x0-2, y0-2, x0+grid_w+2, y0+grid_h+2, fill="#111", outline="#333",
+                                tags=(self.TAG,))
+            self.food_item = cv.create_rectangle(0, 0, 0, 0, fill=SNAKE_FOOD, outline="#111",
+                                                 state="hidden", tags=(self.TAG,))
+            self.score_item = cv.create_text(x0+grid_w+80, y0+20, text="", fill="white",
+                                             font=("Arial", 12), anchor="w", tags=(self.TAG,))
+            self.size = (cols, rows, cell)
+            self.origin = (x0, y0)
+            return 3
+        if self.origin != (x0, y0):
+            ox, oy = self.origin
+            cv.move(self.TAG, x0 - ox, y0 - oy)
+            self.origin = (x0, y0)
+            return 1
+        return 0
+
+    def _bbox(self, x, y):
+        x0, y0 = self.origin
+        s = self.size[2]
+        return (x0+x*s+2, y0+y*s+2, x0+(x+1)*s-2, y0+(y+1)*s-2)
+
+    def _rebuild(self, snake):
+        cv = self.canvas
+        for item in self.segments:
+            cv.delete(item)
+        self.segments = deque(
+            cv.create_rectangle(*self._bbox(sx, sy), fill=SNAKE_HEAD if i == 0 else SNAKE_BODY,
+                                outline="#111", tags=(self.TAG,))
+            for i, (sx, sy) in enumerate(snake)
+        )
+        return 2 * len(snake)
+
+    def draw(self, snake, food, score, food_color=SNAKE_FOOD):
+        """Sincroniza el canvas con la serpiente, la comida y el puntaje.
+
+        Si la serpiente avanzó una sola celda desde el último frame solo se
+        tocan la cabeza nueva, la cabeza anterior y la cola. Devuelve cuántos
+        items se tocaron.
+        """
+        cv = self.canvas
+        segs = self.segments
+        n = len(snake)
+        head = snake[0]
+        touched = 0
+
+        if head != self.head or n != len(segs):
+            if segs and n > 1 and snake[1] == self.head and n - len(segs) in (0, 1):
+                # la cabeza anterior pasa a ser cuerpo
+                cv.itemconfig(segs[0], fill=SNAKE_BODY)
+                if n == len(segs):
+                    # reciclar el item de la cola como nueva cabeza
+                    item = segs.pop()
+                    cv.coords(item, *self._bbox(*head))
+                    cv.itemconfig(item, fill=SNAKE_HEAD)
+                    touched += 3
+                else:
+                    item = cv.create_rectangle(*self._bbox(*head), fill=SNAKE_HEAD,
+                                               outline="#111", tags=(self.TAG,))
+                    touched += 2
+                segs.appendleft(item)
+            else:
+                touched += self._rebuild(snake)
+            self.head = head
+
+        if food != self.food:
+            if food is None:
+                # tablero lleno: ya no hay comida
+                cv.itemconfig(self.food_item, state="hidden")
+            else:
+                cv.coords(self.food_item, *self._bbox(*food))
+                cv.itemconfig(self.food_item, state="normal", fill=food_color)
+            self.food = food
+            touched += 2
+
+        if score != self.score:
+            cv.itemconfig(self.score_item, text=f"Puntaje: {score}")
+            self.score = score
+            touched += 1
+
+        self.last_touched = touched
+        return touched
+
+
+class Effects:
+    """Mensajes y destellos temporales como items del canvas con vencimiento.
+
+    Nada bloquea: el bucle del juego llama a update() en cada frame y los
+    items vencidos se borran ahí.
+    """
+
+    TAG = "fx"
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.reset()
+
+    def reset(self):
+        """Olvida los items activos (p. ej. tras un canvas.delete("all"))."""
+        self.active = {}   # item -> hora de vencimiento (None = hasta remove())
+
+    def add(self, item, duration_ms=None, now=None):
+        if duration_ms is None:
+            self.active[item] = None
+        else:
+            now = time.perf_counter() if now is None else now
+            self.active[item] = now + duration_ms / 1000.0
+        return item
+
+    def text(self, x, y, text, duration_ms=None, fill="white", font=("Arial", 24, "bold")):
+        item = self.canvas.create_text(x, y, text=text, fill=fill, font=font, tags=(self.TAG,))
+        return self.add(item, duration_ms)
+
+    def flash(self, color, duration_ms, size):
+        """Cubre todo el canvas (`size` = ancho, alto) con un color durante `duration_ms`."""
+        cw, ch = size
+        item = self.canvas.create_rectangle(0, 0, cw, ch, fill=color, outline="", tags=(self.TAG,))
+        return self.add(item, duration_ms)
+
+    def remove(self, item):
+        if self.active.pop(item, False) is not False:
+            self.canvas.delete(item)
+
+    def update(self, now):
+        """Borra los items vencidos. Devuelve True si queda alguno activo."""
+        if not self.active:
+            return False
+        expired = [item for item, t in self.active.items() if t is not None and t <= now]
+        for item in expired:
+            del self.active[item]
+            self.canvas.delete(item)
+        if self.active:
+            # siempre por encima del tablero
+            self.canvas.tag_raise(self.TAG)
+        return bool(self.active)
@@ -0,0 +1,261 @@
+# ============================
+# Render con Pillow
+# ============================
+# Alternativa a los renderers de render.py para tableros grandes: en vez de un
+# item del canvas por celda, el tablero es una imagen de Pillow que se arma
+# pegando baldosas pre-renderizadas (una por color, con bisel y borde, al
+# tamaño de celda actual) y se muestra como un único PhotoImage. En cada frame
+# solo se pegan las celdas que cambiaron y el canvas recibe una sola imagen.
+#
+# Misma interfaz que TetrisRenderer/SnakeRenderer (layout, draw, reset,
+# last_touched); runtime.py elige uno u otro con MASTERGAME_RENDERER.
+
+from collections import deque
+
+try:
+    from PIL import Image, ImageDraw, ImageTk
+    PILLOW = True
+except ImportError:   # sin Pillow (o sin soporte de Tk en Pillow)
+    PILLOW = False
+
+from render import TetrisRenderer, SnakeRenderer, SNAKE_HEAD, SNAKE_BODY, SNAKE_FOOD
+
+BOARD_BG = "#111"
+GRID_LINE = "#222"
+
+
+def hex_rgb(color):
+    """'#rgb' o '#rrggbb' -> (r, g, b)."""
+    h = color.lstrip("#")
+    if len(h) == 3:
+        h = "".join(c * 2 for c in h)
+    return tuple(int(h[i:i+2], 16) for i in (0, 2, 4))
+
+
+def shade(rgb, factor):
+    """Aclara (factor > 1) u oscurece (factor < 1) un color."""
+    return tuple(max(0, min(255, int(c * factor))) for c in rgb)
+
+
+class TileAtlas:
+    """Baldosas de `cell` x `cell` por color, generadas una vez por tamaño.
+
+    Todas viven en una sola hoja (`sheet`); `tile()` devuelve el recorte ya
+    hecho, así pegar una celda no crea imágenes nuevas.
+    """
+
+    def __init__(self, cell, painter):
+        self.cell = cell
+        self.painter = painter     # painter(draw, cell, color) dibuja una baldosa
+        self.sheet = Image.new("RGB", (cell, cell))
+        self.boxes = {}
+        self.tiles = {}
+
+    def tile(self, color):
+        tile = self.tiles.get(color)
+        if tile is None:
+            # agrandar la hoja y dibujar la baldosa nueva al final
+            cell = self.cell
+            x = len(self.boxes) * cell
+            if x + cell > self.sheet.width:
+                sheet = Image.new("RGB", (max(x + cell, 2 * self.sheet.width), cell))
+                sheet.paste(self.sheet, (0, 0))
+                self.sheet = sheet
+            box = (x, 0, x + cell, cell)
+            piece = Image.new("RGB", (cell, cell))
+            self.painter(ImageDraw.Draw(piece), cell, color)
+            self.sheet.paste(piece, box)
+            self.boxes[color] = box
+            tile = self.tiles[color] = self.sheet.crop(box)
+        return tile
+
+
+def paint_tetris_tile(draw, cell, color):
+    """Celda vacía (color None) con la cuadrícula, o bloque con bisel."""
+    draw.rectangle((0, 0, cell - 1, cell - 1), fill=BOARD_BG)
+    draw.line((0, 0, cell - 1, 0), fill=GRID_LINE)
+    draw.line((0, 0, 0, cell - 1), fill=GRID_LINE)
+    if color is None:
+        return
+    rgb = hex_rgb(color)
+    draw.rectangle((1, 1, cell - 2, cell - 2), fill=rgb, outline=BOARD_BG)
+    bevel = max(1, cell // 8)
+    light, dark = shade(rgb, 1.35), shade(rgb, 0.6)
+    for i in range(bevel):
+        a, b = 2 + i, cell - 3 - i
+        if a >= b:
+            break
+        draw.line((a, a, b, a), fill=light)
+        draw.line((a, a, a, b), fill=light)
+        draw.line((a, b, b, b), fill=dark)
+        draw.line((b, a, b, b), fill=dark)
+
+
+def paint_snake_tile(draw, cell, color):
+    """Fondo liso o segmento/comida con el mismo margen que SnakeRenderer."""
+    draw.rectangle((0, 0, cell - 1, cell - 1), fill=BOARD_BG)
+    if color is not None and cell > 4:
+        draw.rectangle((2, 2, cell - 3, cell - 3), fill=hex_rgb(color), outline=BOARD_BG)
+
+
+class PillowTetrisRenderer(TetrisRenderer):
+    """TetrisRenderer que dibuja el tablero como una sola imagen."""
+
+    def reset(self):
+        super().reset()
+        self.atlas = None
+        self.image = None
+        self.photo = None
+        self.image_item = None
+        self.last_tiles = 0    # baldosas pegadas en el último frame
+
+    def _build(self, x0, y0, cols, rows, cell):
+        cv = self.canvas
+        tags = (self.TAG, self.BOARD_TAG)
+        bw = cols * cell
+        bh = rows * cell
+        cv.create_rectangle(x0-2, y0-2, x0+bw+2, y0+bh+2, fill=BOARD_BG, outline="#333", tags=tags)
+
+        self.atlas = TileAtlas(cell, paint_tetris_tile)
+        empty = self.atlas.tile(None)
+        self.image = Image.new("RGB", (bw, bh))
+        for y in range(rows):
+            for x in range(cols):
+                self.image.paste(empty, (x*cell, y*cell))
+        self.photo = ImageTk.PhotoImage(self.image)
+        self.image_item = cv.create_image(x0, y0, image=self.photo, anchor="nw", tags=tags)
+
+        self.score_item = cv.create_text(x0 + bw + 80, y0 + 20, text="", fill="white",
+                                         font=("Arial", 12), anchor="w", tags=tags)
+        self.items = [self.image_item]
+        self.shown = [0] * (cols * rows)
+        self.size = (cols, rows, cell)
+        self.origin = (x0, y0)
+
+    def draw(self, board, piece_cells, piece_color, score):
+        """Igual que TetrisRenderer.draw; los items tocados son la imagen y el puntaje."""
+        cols, rows, cell = self.size
+        frame = bytearray(board)
+        for x, y in piece_cells:
+            if 0 <= x < cols and 0 <= y < rows:
+                frame[y*cols + x] = piece_color
+
+        palette = self.palette
+        tile = self.atlas.tile
+        paste = self.image.paste
+        shown = self.shown
+        tiles = 0
+        for i, color in enumerate(frame):
+            if color != shown[i]:
+                y, x = divmod(i, cols)
+                paste(tile(palette[color] if color else None), (x*cell, y*cell))
+                shown[i] = color
+                tiles += 1
+
+        touched = 0
+        if tiles:
+            self.photo.paste(self.image)
+            touched += 1
+        if score != self.score:
+            self.canvas.itemconfig(self.score_item, text=f"Puntaje: {score}")
+            self.score = score
+            touched += 1
+
+        self.last_tiles = tiles
+        self.last_touched = touched
+        return touched
+
+
+class PillowSnakeRenderer(SnakeRenderer):
+    """SnakeRenderer que dibuja la grilla como una sola imagen.
+
+    Igual que la versión de canvas, si la serpiente avanzó una celda solo se
+    pegan la cabeza nueva, la cabeza anterior y la cola que se liberó.
+    """
+
+    def reset(self):
+        super().reset()
+        self.atlas = None
+        self.image = None
+        self.photo = None
+        self.image_item = None
+        self.body = deque()    # celdas dibujadas, cabeza a la izquierda
+        self.food_color = None
+        self.last_tiles = 0
+
+    def layout(self, x0, y0, cols, rows, cell):
+        cv = self.canvas
+        if self.size != (cols, rows, cell):
+            cv.delete(self.TAG)
+            self.reset()
+            grid_w = cols * cell
+            grid_h = rows * cell
+            cv.create_rectangle(x0-2, y0-2, x0+grid_w+2, y0+grid_h+2, fill=BOARD_BG, outline="#333",
+                                tags=(self.TAG,))
+            self.atlas = TileAtlas(cell, paint_snake_tile)
+            self.image = Image.new("RGB", (grid_w, grid_h), hex_rgb(BOARD_BG))
+            self.photo = ImageTk.PhotoImage(self.image)
+            self.image_item = cv.create_image(x0, y0, image=self.photo, anchor="nw", tags=(self.TAG,))
+            self.score_item = cv.create_text(x0+grid_w+80, y0+20, text="", fill="white",
+                                             font=("Arial", 12), anchor="w", tags=(self.TAG,))
+            self.size = (cols, rows, cell)
+            self.origin = (x0, y0)
+            return 3
+        return super().layout(x0, y0, cols, rows, cell)
+
+    def _paste(self, pos, color):
+        cell = self.size[2]
+        self.image.paste(self.atlas.tile(color), (pos[0]*cell, pos[1]*cell))
+
+    def draw(self, snake, food, score, food_color=SNAKE_FOOD):
+        """Igual que SnakeRenderer.draw; los items tocados son la imagen y el puntaje."""
+        body = self.body
+        n = len(snake)
+        head = snake[0]
+        tiles = 0
+        new_food = food != self.food or food_color != self.food_color
+
+        # la comida vieja se borra antes de la serpiente (que puede estar
+        # encima) y la nueva se pega después (puede caer donde hubo cuerpo)
+        if new_food and self.food is not None and self.food != head:
+            self._paste(self.food, None)
+            tiles += 1
+
+        if head != self.head or n != len(body):
+            if body and n > 1 and snake[1] == self.head and n - len(body) <= 1:
+                # la cabeza anterior pasa a ser cuerpo y la cola se libera
+                self._paste(self.head, SNAKE_BODY)
+                body.appendleft(head)
+                self._paste(head, SNAKE_HEAD)
+                tiles += 2
+                while len(body) > n:
+                    self._paste(body.pop(), None)
+                    tiles += 1
+            else:
+                for pos in body:
+                    self._paste(pos, None)
+                self.body = body = deque(snake)
+                for i, pos in enumerate(body):
+                    self._paste(pos, SNAKE_HEAD if i == 0 else SNAKE_BODY)
+                tiles += 2 * n
+            self.head = head
+
+        if new_food:
+            if food is not None:
+                self._paste(food, food_color)
+                tiles += 1
+            self.food = food
+            self.food_color = food_color
+
+        touched = 0
+        if tiles:
+            self.photo.paste(self.image)
+            touched += 1
+        if score != self.score:
+            self.canvas.itemconfig(self.score_item, text=f"Puntaje: {score}")
+            self.score = score
+            touched += 1
+
+        self.last_tiles = tiles
+        self.last_touched = touched
+        return touched
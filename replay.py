@@ -0,0 +1,251 @@
+# ============================
+# Grabación y repetición de partidas
+# ============================
+# Una partida queda determinada por su semilla, sus parámetros y las acciones
+# que recibió el motor en cada tick. El archivo (.mgr) es binario:
+#
+#   cabecera  "MGRP", versión, juego, semilla, largo + JSON de los parámetros
+#   registros (tick, acción) con struct "<IB": 5 bytes por acción
+#   cierre    END_TICK, END_ACTION, ticks totales y sha256 del estado final
+#
+# `tick` es cuántos pasos de lógica (gravedad / avance) se aplicaron antes de
+# la acción. Repetir = mismos pasos en el mismo orden, así que el estado final
+# debe coincidir byte a byte con el hash grabado.
+#
+#   python replay.py info partida.mgr
+#   python replay.py run partida.mgr [--repeat 20]    # sin interfaz, a máxima velocidad
+#   python replay.py play partida.mgr                 # en el canvas, en tiempo real
+
+import argparse
+import hashlib
+import json
+import os
+import struct
+import sys
+import time
+
+from engine import TetrisEngine, SnakeEngine, LEFT, RIGHT, DOWN, UP, DROP, ROTATE, POWER, TICK
+from gameconfig import TetrisSettings, SnakeSettings
+
+MAGIC = b"MGRP"
+VERSION = 1
+GAMES = ("tetris", "snake")
+ACTIONS = (LEFT, RIGHT, DOWN, UP, DROP, ROTATE, POWER)
+ACTION_CODES = {name: code for code, name in enumerate(ACTIONS)}
+
+HEADER = struct.Struct("<4sBBQI")   # magic, versión, juego, semilla, largo del JSON
+RECORD = struct.Struct("<IB")       # tick, acción
+TRAILER = struct.Struct("<I32s")    # ticks totales, sha256 del estado final
+END_TICK = 0xFFFFFFFF
+END_ACTION = 0xFF
+
+SETTINGS_CLASSES = {"tetris": TetrisSettings, "snake": SnakeSettings}
+EXTENSION = ".mgr"
+
+
+class ReplayError(ValueError):
+    pass
+
+
+def new_seed():
+    return int.from_bytes(os.urandom(8), "little") >> 1
+
+
+def new_engine(game, settings, seed):
+    cls = TetrisEngine if game == "tetris" else SnakeEngine
+    return cls(**settings.engine_args(), seed=seed)
+
+
+def apply(game, engine, action):
+    """Aplica una acción grabada tal como la aplicó el juego."""
+    if game == "tetris":
+        return engine.step(action)
+    engine.turn(action)
+    return 0
+
+
+def advance(game, engine):
+    """Un paso de lógica (gravedad en Tetris, avance en Snake)."""
+    return engine.step(TICK) if game == "tetris" else engine.step()
+
+
+def state_hash(engine):
+    """sha256 del estado completo del motor, incluido el generador aleatorio."""
+    data = [engine.state(), getattr(engine, "pending", 0), engine.rng.getstate()]
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode("utf-8")).digest()
+
+
+def settings_to_dict(settings):
+    return dict(vars(settings))
+
+
+def settings_from_dict(game, data):
+    settings = SETTINGS_CLASSES[game].__new__(SETTINGS_CLASSES[game])
+    vars(settings).update(data)
+    # JSON no tiene tuplas: la tabla de niveles vuelve a ser inmutable
+    settings.level_ms = tuple(settings.level_ms)
+    return settings
+
+
+class Recorder:
+    """Escribe la partida a medida que se juega (con buffer del archivo)."""
+
+    def __init__(self, path, game, seed, settings):
+        self.path = path
+        self.game = game
+        self.ticks = 0
+        blob = json.dumps(settings_to_dict(settings), ensure_ascii=False).encode("utf-8")
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION, GAMES.index(game), seed, len(blob)))
+        self.file.write(blob)
+
+    def action(self, action):
+        self.file.write(RECORD.pack(self.ticks, ACTION_CODES[action]))
+
+    def tick(self):
+        self.ticks += 1
+
+    def close(self, engine):
+        """Cierra el archivo con los ticks totales y el hash del estado final."""
+        if self.file is None:
+            return
+        self.file.write(RECORD.pack(END_TICK, END_ACTION))
+        self.file.write(TRAILER.pack(self.ticks, state_hash(engine)))
+        self.file.close()
+        self.file = None
+
+
+def recorder_for(directory, game, seed, settings):
+    """Recorder en `directory` con un nombre según el juego, la fecha y la semilla."""
+    os.makedirs(directory, exist_ok=True)
+    name = f"{game}_{time.strftime('%Y%m%d_%H%M%S')}_{seed:x}{EXTENSION}"
+    return Recorder(os.path.join(directory, name), game, seed, settings)
+
+
+class Replay:
+    """Partida grabada: juego, semilla, parámetros, acciones y estado final."""
+
+    def __init__(self, game, seed, settings, records, ticks, final_hash):
+        self.game = game
+        self.seed = seed
+        self.settings = settings
+        self.records = records        # [(tick, acción)]
+        self.ticks = ticks
+        self.final_hash = final_hash
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) < HEADER.size:
+            raise ReplayError(f"{path}: archivo demasiado corto")
+        magic, version, game, seed, size = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION or game >= len(GAMES):
+            raise ReplayError(f"{path}: no es una grabación válida")
+        game = GAMES[game]
+        pos = HEADER.size + size
+        settings = settings_from_dict(game, json.loads(data[HEADER.size:pos].decode("utf-8")))
+        records = []
+        ticks = final_hash = None
+        while pos + RECORD.size <= len(data):
+            tick, code = RECORD.unpack_from(data, pos)
+            pos += RECORD.size
+            if tick == END_TICK and code == END_ACTION:
+                if pos + TRAILER.size <= len(data):
+                    ticks, final_hash = TRAILER.unpack_from(data, pos)
+                break
+            if code >= len(ACTIONS):
+                raise ReplayError(f"{path}: acción desconocida {code} en el tick {tick}")
+            records.append((tick, ACTIONS[code]))
+        if ticks is None:
+            # partida sin cerrar (el juego se cortó): se repite hasta la última acción
+            ticks = records[-1][0] if records else 0
+        return cls(game, seed, settings, records, ticks, final_hash)
+
+    def run(self):
+        """Repite la partida sin interfaz; devuelve el motor en su estado final."""
+        game = self.game
+        engine = new_engine(game, self.settings, self.seed)
+        ticks = 0
+        for tick, action in self.records:
+            while ticks < tick:
+                advance(game, engine)
+                ticks += 1
+            apply(game, engine, action)
+        while ticks < self.ticks:
+            advance(game, engine)
+            ticks += 1
+        return engine
+
+    def verify(self, engine=None):
+        """True si el estado final coincide con el grabado (None si no hay hash)."""
+        if self.final_hash is None:
+            return None
+        return state_hash(engine or self.run()) == self.final_hash
+
+
+class Player:
+    """Entrega las acciones grabadas tick a tick (para repetir en el canvas)."""
+
+    def __init__(self, replay):
+        self.replay = replay
+        self.ticks = 0
+        self._next = 0
+
+    def actions(self):
+        """Acciones grabadas antes del próximo paso de lógica."""
+        records = self.replay.records
+        start = self._next
+        while self._next < len(records) and records[self._next][0] <= self.ticks:
+            self._next += 1
+        return [action for _, action in records[start:self._next]]
+
+    def tick(self):
+        self.ticks += 1
+
+    @property
+    def done(self):
+        return self.ticks >= self.replay.ticks and self._next >= len(self.replay.records)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Grabaciones de MasterGame")
+    ap.add_argument("command", choices=("info", "run", "play"))
+    ap.add_argument("path")
+    ap.add_argument("--repeat", type=int, default=1, help="repeticiones para medir (run)")
+    args = ap.parse_args(argv)
+
+    try:
+        replay = Replay.load(args.path)
+    except (OSError, ReplayError) as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    if args.command == "info":
+        print(f"juego {replay.game}  semilla {replay.seed}  ticks {replay.ticks}  "
+              f"acciones {len(replay.records)}  cerrada {replay.final_hash is not None}")
+        return 0
+
+    if args.command == "play":
+        from runtime import MasterGame
+        app = MasterGame()
+        app.root.after(100, app.start_replay, replay)
+        app.start()
+        return 0
+
+    t0 = time.perf_counter()
+    for _ in range(args.repeat):
+        engine = replay.run()
+    elapsed = (time.perf_counter() - t0) / args.repeat
+    ok = replay.verify(engine)
+    print(f"puntaje {engine.score}  ticks {replay.ticks}  {elapsed * 1000:.2f} ms por repetición "
+          f"({replay.ticks / elapsed if elapsed else 0:,.0f} ticks/s)")
+    if ok is None:
+        print("la grabación no tiene hash final (partida sin cerrar)")
+        return 0
+    print("estado final idéntico" if ok else "ESTADO FINAL DISTINTO")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
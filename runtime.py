@@ -1,19 +1,57 @@
 import tkinter as tk
 from tkinter import messagebox
-import random
+import argparse
 import time
 import sys
 import os
 
-try:
-    import pygame
-    pygame.mixer.init()
-    PYGAME = True
-except Exception:
-    PYGAME = False
+from engine import (TetrisEngine, SnakeEngine, LEFT, RIGHT, UP, DOWN, DROP, ROTATE, POWER, TICK, DIRECTIONS,
+                    EV_FOOD, EV_GAME_OVER, EV_WIN, EV_POWER, EV_POWER_USED, EV_POWER_LOCKED)
+from audio import open_audio
+from autopilot import SnakeAutopilot
+from bot import TetrisBot
+from inputs import InputQueue, coalesce_tetris, next_snake_turn
+from gameconfig import load_settings, ConfigError, TetrisSettings, SnakeSettings
+from perf import FrameStats, Tracer, Profiler
+from render import TetrisRenderer, SnakeRenderer, Effects, tetris_palette, TETRIS_BAR_H
+from render_pillow import PILLOW, PillowTetrisRenderer, PillowSnakeRenderer
+from replay import Player, new_seed, recorder_for, state_hash
+
+# teclas -> acciones del motor
+TETRIS_KEYS = {"1": LEFT, "2": DOWN, "3": RIGHT, "5": DROP, "6": POWER, "7": ROTATE}
+SNAKE_KEYS = {
+    "w": UP, "Up": UP, "s": DOWN, "Down": DOWN,
+    "a": LEFT, "Left": LEFT, "d": RIGHT, "Right": RIGHT,
+}
+
+FRAME_MS = 16     # cadencia del bucle: render y efectos
+RESIZE_DEBOUNCE_MS = 150   # se reacomoda una vez que el tamaño deja de cambiar
+MIN_CELL = 6      # tamaño de celda (px) entre los que se ajusta el tablero
+MAX_CELL = 96
+SIDE_W = 180      # lugar reservado a cada lado del tablero (el puntaje va a la derecha)
+BAR_H = TETRIS_BAR_H   # barra de comandos de Tetris (la dibuja TetrisRenderer)
+MAX_CATCHUP = 5   # pasos de lógica por frame antes de descartar ticks atrasados
+STATS_FILE = "frame_stats.json"
+REPLAY_DIR_ENV = "MASTERGAME_REPLAY_DIR"   # carpeta donde grabar las partidas (opcional)
+TRACE_ENV = "MASTERGAME_TRACE"            # archivo de trace (formato Chrome) al salir
+CPROFILE_ENV = "MASTERGAME_CPROFILE"      # archivo .prof de cProfile al salir
+RENDERER_ENV = "MASTERGAME_RENDERER"      # "canvas" (un item por celda) o "pillow"
+
+# backend de dibujo -> (renderer de Tetris, renderer de Snake)
+RENDERERS = {"canvas": (TetrisRenderer, SnakeRenderer)}
+if PILLOW:
+    RENDERERS["pillow"] = (PillowTetrisRenderer, PillowSnakeRenderer)
 
 class MasterGame:
-    def __init__(self, width=800, height=600):
+    def __init__(self, width=800, height=600, trace=None, cprofile=None):
+        # instrumentación opcional: trace de cada paso/dibujo/tecla y cProfile
+        self.trace_path = trace or os.environ.get(TRACE_ENV)
+        self.tracer = Tracer() if self.trace_path else None
+        cprofile = cprofile or os.environ.get(CPROFILE_ENV)
+        self.profiler = Profiler(cprofile) if cprofile else None
+        if self.profiler:
+            self.profiler.start()
+
         self.root = tk.Tk()
         self.root.title("MasterGame — Tetris + Snake (Gráfico)")
         self.root.protocol("WM_DELETE_WINDOW", self._on_quit)
@@ -25,21 +63,19 @@ class MasterGame:
             # Si falla (porque estás en Linux), usa el comando de Linux
             self.root.attributes("-zoomed", True)
 
-        self.snd_tetris = None
-        self.snd_snake = None
-        if PYGAME:
-            try:
-                if os.path.exists("keyboard.wav"):
-                    self.snd_tetris = pygame.mixer.Sound("keyboard.wav")
-                if os.path.exists("eating.wav"):
-                    self.snd_snake = pygame.mixer.Sound("eating.wav")
-            except Exception:
-                self.snd_tetris = None
-                self.snd_snake = None
+        # sonidos precargados (NullAudio si no hay pygame o dispositivo)
+        self.audio = open_audio()
 
         self.mode = None  
         self.running = False
 
+        # parámetros desde Tetris.txt / Snake.txt (se cargan una sola vez)
+        try:
+            self.t_settings, self.s_settings = load_settings()
+        except (OSError, SyntaxError, ConfigError) as e:
+            print(f"Configuración inválida, se usan los valores por defecto:\n{e}")
+            self.t_settings, self.s_settings = TetrisSettings(), SnakeSettings()
+
         # ---------------------------
         # LAYOUT RESPONSIVE (GRID)
         # ---------------------------
@@ -67,7 +103,10 @@ class MasterGame:
         self.WIN_W = width
         self.WIN_H = height
 
-        # redibujar al cambiar tamaño (responsive)
+        # redibujar al cambiar tamaño (responsive), una vez que se asienta
+        self.canvas_size = (self.WIN_W - self.left_w - 20, self.WIN_H - 20)
+        self._resize_after = None
+        self._pending_size = None
         self.canvas.bind("<Configure>", self._on_resize)
 
         # ---------------------------
@@ -75,7 +114,11 @@ class MasterGame:
         # ---------------------------
         tk.Label(self.left_frame, text="MasterGame", font=("Arial", 16, "bold")).pack(pady=(6,12))
         tk.Button(self.left_frame, text="Jugar Tetris", width=18, command=self.start_tetris).pack(pady=4)
+        tk.Button(self.left_frame, text="Tetris automático", width=18, command=self.start_tetris_bot).pack(pady=4)
         tk.Button(self.left_frame, text="Jugar Snake", width=18, command=self.start_snake).pack(pady=4)
+        tk.Button(self.left_frame, text="Snake automático", width=18, command=self.start_snake_autopilot).pack(pady=4)
+        self.renderer_button = tk.Button(self.left_frame, width=18, command=self.toggle_renderer)
+        self.renderer_button.pack(pady=4)
         tk.Button(self.left_frame, text="Parar / Volver al menú", width=18, command=self.stop_game).pack(pady=8)
         tk.Button(self.left_frame, text="Salir", width=18, command=self._on_quit).pack(pady=8)
 
@@ -88,6 +131,17 @@ class MasterGame:
 
         # clock
         self._after_id = None
+        self._tick = 0.5        # segundos por paso de lógica
+        self._next_tick = 0.0
+        self._dirty = False
+        self._step_fn = None
+        self._draw_fn = None
+        self._drain_fn = None
+        self.inputs = InputQueue()   # teclas pendientes, las consume el bucle
+        self.stats = FrameStats()
+        self.show_stats = self.tracer is not None   # con trace el HUD arranca visible
+        self._stats_item = None
+        self._stats_shown_at = 0.0
 
         # parámetros Tetris
         self.t_width = 10
@@ -95,11 +149,32 @@ class MasterGame:
         self.cell = 24
         self.t_margin_x = 20
         self.t_margin_y = 20
+        self.t_frame_items = 0
 
         # parámetros Snake
         self.s_cols = 30
         self.s_rows = 20
         self.s_cell = 20
+        self.s_frame_items = 0
+
+        # renderers (canvas o Pillow, ver RENDERERS)
+        renderer = os.environ.get(RENDERER_ENV, "canvas")
+        if renderer not in RENDERERS:
+            print(f"{RENDERER_ENV}={renderer} no disponible, se usa canvas")
+            renderer = "canvas"
+        self._set_renderer(renderer)
+
+        # mensajes, destellos y pausa (sin bloquear el bucle)
+        self.effects = Effects(self.canvas)
+        self.paused = False
+        self._pause_item = None
+
+        # grabación de partidas (si está MASTERGAME_REPLAY_DIR) y repetición
+        self.replay_dir = os.environ.get(REPLAY_DIR_ENV)
+        self.recorder = None
+        self.player = None
+        self.bot = None      # TetrisBot en el modo automático
+        self.autopilot = None   # SnakeAutopilot en el modo automático
 
         # mostrar menú inicial
         self._show_menu_info()
@@ -114,16 +189,10 @@ class MasterGame:
             "Snake: WASD o flechas, Q para salir\n\n"
             "Nota: ambos juegos son gráficos (canvas)."
         ))
-        self.canvas.delete("all")
+        self._clear_canvas()
 
-        # Medidas del canvas (con fallback si aún no se ha dibujado)
-        cw = self.canvas.winfo_width()
-        ch = self.canvas.winfo_height()
-
-        if cw < 50:
-            cw = self.WIN_W - self.left_w - 20
-        if ch < 50:
-            ch = self.WIN_H - 20
+        # medidas del canvas del último reacomodo (o las iniciales)
+        cw, ch = self.canvas_size
 
         # Título
         self.canvas.create_text(
@@ -134,44 +203,81 @@ class MasterGame:
             justify="center"
         )
 
+    def _clear_canvas(self):
+        self.canvas.delete("all")
+        self.t_view.reset()
+        self.s_view.reset()
+        self.effects.reset()
+        self._stats_item = None
+
     def _on_resize(self, event):
-        """Se ejecuta cada vez que el canvas cambia de tamaño."""
-        
-        # Redibujar menú
+        """<Configure>: junta los eventos y reacomoda cuando dejan de llegar."""
+        size = (event.width, event.height)
+        if size == self.canvas_size and self._resize_after is None:
+            return
+        self._pending_size = size
+        if self._resize_after is not None:
+            self.canvas.after_cancel(self._resize_after)
+        self._resize_after = self.canvas.after(RESIZE_DEBOUNCE_MS, self._relayout)
+
+    def _relayout(self):
+        """Recalcula celda y márgenes para el tamaño actual (una vez por resize)."""
+        self._resize_after = None
+        self.canvas_size = cw, ch = self._pending_size
         if self.mode is None:
             self._show_menu_info()
+        elif self.mode == "tetris":
+            self._layout_tetris(cw, ch)
+            self._dirty = True
+        elif self.mode == "snake":
+            self._layout_snake(cw, ch)
+            self._dirty = True
+
+    def _fit_cell(self, cols, rows, avail_w, avail_h):
+        """Celda más grande con la que cols x rows entra en el área disponible."""
+        return max(MIN_CELL, min(MAX_CELL, avail_w // cols, avail_h // rows))
+
+    def _layout_tetris(self, cw, ch):
+        self.cell = self._fit_cell(self.t_width, self.t_height, cw - 2*SIDE_W, ch - BAR_H - 40)
+        self.t_margin_x = (cw - self.t_width*self.cell) // 2
+        self.t_margin_y = (ch - BAR_H - self.t_height*self.cell) // 2
+
+    def _layout_snake(self, cw, ch):
+        self.s_cell = self._fit_cell(self.s_cols, self.s_rows, cw - 2*SIDE_W, ch - 40)
+        self.s_margin_x = (cw - self.s_cols*self.s_cell) // 2
+        self.s_margin_y = (ch - self.s_rows*self.s_cell) // 2
+
+    def _set_renderer(self, name):
+        """Crea los renderers del backend `name` (descartando los items del anterior)."""
+        tetris_cls, snake_cls = RENDERERS[name]
+        palette = None
+        if getattr(self, "t_view", None):
+            palette = self.t_view.palette
+            self.canvas.delete(self.t_view.TAG)
+            self.canvas.delete(self.s_view.TAG)
+        self.renderer = name
+        self.t_view = tetris_cls(self.canvas, palette)
+        self.s_view = snake_cls(self.canvas)
+        self.renderer_button.config(text=f"Render: {name}")
+
+    def toggle_renderer(self):
+        """Alterna entre los backends de dibujo disponibles (también en juego)."""
+        names = list(RENDERERS)
+        if len(names) < 2:
+            messagebox.showinfo("Render", "Pillow no está disponible: solo hay render de canvas.")
             return
-
-        # Reposicionar Tetris
-        if self.mode == "tetris":
-            new_w = event.width
-            new_h = event.height
-
-            # recalcular márgenes para centrar el tablero
-            self.t_margin_x = (new_w - (self.t_width * self.cell)) // 2
-            self.t_margin_y = (new_h - (self.t_height * self.cell)) // 2
-
-            self._draw_tetris()
-            return
-
-        # Reposicionar Snake
-        if self.mode == "snake":
-            new_w = event.width
-            new_h = event.height
-
-            self.s_margin_x = (new_w - (self.s_cols * self.s_cell)) // 2
-            self.s_margin_y = (new_h - (self.s_rows * self.s_cell)) // 2
-
-            self._draw_snake()
-            return
+        self._set_renderer(names[(names.index(self.renderer) + 1) % len(names)])
+        if self.running:
+            self._dirty = True
 
     def _on_quit(self):
         self.stop_game()
-        try:
-            if PYGAME:
-                pygame.mixer.quit()
-        except Exception:
-            pass
+        if self.profiler:
+            print(self.profiler.stop())
+            print(f"Perfil guardado en {self.profiler.path}")
+        if self.tracer:
+            print(f"Trace guardado en {self.tracer.dump(self.trace_path)}")
+        self.audio.close()
         self.root.destroy()
         try:
             sys.exit(0)
@@ -181,7 +287,17 @@ class MasterGame:
     def _on_key(self, event):
         k = event.keysym
         ch = event.char
-        # pass to active mode handler
+        if k == "F3":
+            self._toggle_stats()
+            return
+        if k == "F4":
+            print(f"Estadísticas guardadas en {self.stats.dump(STATS_FILE)}")
+            if self.tracer:
+                print(f"Trace guardado en {self.tracer.dump(self.trace_path)}")
+            return
+        if self.tracer:
+            self.tracer.instant(f"key {k}", time.perf_counter())
+        # pass to active mode handler (solo encolan; el bucle aplica)
         if self.mode == "tetris":
             self._tetris_handle_key(k, ch)
         elif self.mode == "snake":
@@ -190,218 +306,281 @@ class MasterGame:
     def start(self):
         self.root.mainloop()
 
+    # ---------------------------
+    # Game loop (paso fijo)
+    # ---------------------------
+    def _start_loop(self, interval_ms, step, draw, drain=None):
+        """Arranca el bucle: `step` corre cada `interval_ms` y `draw` por frame.
+
+        `drain`, si se indica, aplica la cola de entrada una vez por frame.
+        """
+        self._cancel_loop()
+        self._step_fn = step
+        self._draw_fn = draw
+        self._drain_fn = drain
+        self.inputs.clear()
+        self._tick = interval_ms / 1000.0
+        self._next_tick = time.perf_counter() + self._tick
+        self._dirty = True
+        self.paused = False
+        self._pause_item = None
+        self._after_id = self.canvas.after(FRAME_MS, self._loop)
+
+    def _update_speed(self, interval_ms):
+        """Cambia el intervalo de la lógica desde el próximo tick."""
+        self._tick = interval_ms / 1000.0
+        if self.mode == "tetris":
+            self.t_speed = interval_ms
+        elif self.mode == "snake":
+            self.s_speed = interval_ms
+
+    def _cancel_loop(self):
+        if self._after_id:
+            try:
+                self.canvas.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def _loop(self):
+        # la lógica avanza en pasos fijos según un reloj monótono; si el
+        # bucle se atrasa recupera hasta MAX_CATCHUP pasos y descarta el
+        # resto, y el render ocurre una vez por frame, separado de la lógica
+        self._after_id = None
+        if not self.running:
+            return
+        stats = self.stats
+        tracer = self.tracer
+        now = time.perf_counter()
+        steps = 0
+        if self.paused:
+            # en pausa el reloj de la lógica no avanza
+            self._next_tick = now + self._tick
+        elif self._drain_fn and (self.inputs or self.bot):
+            t0 = time.perf_counter()
+            self._drain_fn()
+            t1 = time.perf_counter()
+            stats.keys.add((t1 - t0) * 1000)
+            if tracer:
+                tracer.complete(self._drain_fn.__name__, t0, t1, "input")
+        while self.running and not self.paused and now >= self._next_tick:
+            if steps == MAX_CATCHUP:
+                missed = int((now - self._next_tick) / self._tick) + 1
+                self._next_tick += missed * self._tick
+                stats.dropped += missed
+                if tracer:
+                    tracer.instant("dropped_ticks", now, count=missed)
+                break
+            stats.jitter.add((now - self._next_tick) * 1000)
+            t0 = time.perf_counter()
+            self._step_fn()
+            t1 = time.perf_counter()
+            stats.logic.add((t1 - t0) * 1000)
+            if tracer:
+                tracer.complete(self._step_fn.__name__, t0, t1, "logic")
+            stats.ticks += 1
+            self._next_tick += self._tick
+            self._dirty = True
+            steps += 1
+        if not self.running:
+            return
+        if self._dirty:
+            t0 = time.perf_counter()
+            self._draw_fn()
+            t1 = time.perf_counter()
+            stats.render.add((t1 - t0) * 1000)
+            stats.frame(t1)
+            self._dirty = False
+            if tracer:
+                tracer.complete(self._draw_fn.__name__, t0, t1, "render")
+                stats.items = len(self.canvas.find_all())
+                tracer.counter("canvas", t1, items=stats.items)
+        self.effects.update(now)
+        if self.show_stats and now - self._stats_shown_at >= 0.5:
+            self._draw_stats()
+            self._stats_shown_at = now
+        delay = int((self._next_tick - time.perf_counter()) * 1000)
+        self._after_id = self.canvas.after(max(1, min(FRAME_MS, delay)), self._loop)
+
+    def toggle_pause(self):
+        """Pausa o reanuda la partida; el bucle sigue vivo para los efectos."""
+        if not self.running:
+            return
+        self.paused = not self.paused
+        self.inputs.clear()
+        if self.paused:
+            cw = self.canvas_size[0]
+            self._pause_item = self.effects.text(cw//2, 50, "PAUSA (4 para seguir)", fill="yellow")
+        elif self._pause_item:
+            self.effects.remove(self._pause_item)
+            self._pause_item = None
+
+    def _toggle_stats(self):
+        self.show_stats = not self.show_stats
+        if self.show_stats:
+            self._draw_stats()
+        elif self._stats_item:
+            self.canvas.delete(self._stats_item)
+            self._stats_item = None
+
+    def _draw_stats(self):
+        if not self.tracer:
+            # con trace ya se cuenta en cada frame
+            self.stats.items = len(self.canvas.find_all())
+        text = f"render {self.renderer}\n" + self.stats.overlay_text()
+        if self._stats_item is None:
+            self._stats_item = self.canvas.create_text(
+                10, 10, text=text, fill="#00ff99", font=("Courier", 10), anchor="nw")
+        else:
+            self.canvas.itemconfig(self._stats_item, text=text)
+        self.canvas.tag_raise(self._stats_item)
+
     # ---------------------------
     # Stop game / return to menu
     # ---------------------------
     def stop_game(self):
         if self.running:
             self.running = False
+            self._end_recording(self.tetris if self.mode == "tetris" else self.snake)
+            self.player = None
+            self.bot = None
+            self.autopilot = None
             # cancel after
-            if self._after_id:
-                try:
-                    self.canvas.after_cancel(self._after_id)
-                except Exception:
-                    pass
-                self._after_id = None
+            self._cancel_loop()
             self.mode = None
-            self.canvas.delete("all")
             self._show_menu_info()
+    # ---------------------------
+    # Grabación / repetición
+    # ---------------------------
+    def _begin_recording(self, game, seed, settings):
+        self.recorder = None
+        if self.player or not self.replay_dir:
+            return
+        try:
+            self.recorder = recorder_for(self.replay_dir, game, seed, settings)
+        except OSError as e:
+            print(f"No se pudo grabar la partida: {e}")
+
+    def _end_recording(self, engine):
+        if self.recorder:
+            self.recorder.close(engine)
+            print(f"Partida grabada en {self.recorder.path}")
+            self.recorder = None
+
+    def start_replay(self, replay):
+        """Repite una grabación (replay.Replay) en el canvas, en tiempo real."""
+        if self.running:
+            messagebox.showinfo("En ejecución", "Ya hay un juego en ejecución. Deténlo primero.")
+            return
+        self.player = Player(replay)
+        if replay.game == "tetris":
+            self.start_tetris(replay)
+        else:
+            self.start_snake(replay)
+
+    def _replay_verdict(self, engine):
+        """Texto con el resultado de comparar el estado final con la grabación."""
+        final = self.player.replay.final_hash
+        if final is None:
+            return "Repetición terminada (grabación sin cerrar)"
+        if state_hash(engine) == final:
+            return "Repetición terminada: estado final idéntico"
+        return "Repetición terminada: el estado final NO coincide"
+
+    def _replay_finished(self, engine):
+        """True (y termina la repetición) si ya no quedan ticks grabados."""
+        if self.player.ticks < self.player.replay.ticks:
+            return False
+        texto = self._replay_verdict(engine)
+        self.stop_game()
+        self.info_label.config(text=texto)
+        return True
+
     # =========================
     #  TETRIS implementation
     # =========================
-    def start_tetris(self):
+    def start_tetris(self, replay=None):
         if self.running:
             messagebox.showinfo("En ejecución", "Ya hay un juego en ejecución. Deténlo primero.")
             return
         self.mode = "tetris"
         self.running = True
+        self.bot = None
+        self._clear_canvas()
         # board size
-        cfg_w = 10
-        cfg_h = 20
-        self.t_width = cfg_w
-        self.t_height = cfg_h
-        self.cell = 24
-        # compute margins to center board
-        canvas_w = max(self.canvas.winfo_width(), (self.t_width*self.cell)+40)
-        canvas_h = max(self.canvas.winfo_height(), (self.t_height*self.cell)+40)
-        self.t_margin_x = (canvas_w - (self.t_width*self.cell))//2
-        self.t_margin_y = (canvas_h - (self.t_height*self.cell))//2
-        # init tetris state
-        self.t_board = [[0 for _ in range(self.t_width)] for _ in range(self.t_height)]
-        self.t_score = 0
-        self.t_power_used = False
-        self.t_speed = 500  # ms per fall step
-        # pieces (tetrominoes) as matrix of 1/0
-        self.t_pieces = [
-            ([[1,1],
-              [1,1]], "yellow"),  # O
-            ([[1,1,1,1]], "cyan"),  # I
-            ([[0,1,1],
-              [1,1,0]], "green"),  # S
-            ([[1,1,0],
-              [0,1,1]], "red"),    # Z
-            ([[1,0,0],
-              [1,1,1]], "orange"), # L
-            ([[0,0,1],
-              [1,1,1]], "blue"),   # J
-            ([[0,1,0],
-              [1,1,1]], "magenta") # T
-        ]
-        self._spawn_t_piece()
+        cfg = self.t_cfg = replay.settings if replay else self.t_settings
+        self.t_width = cfg.width
+        self.t_height = cfg.height
+        self._layout_tetris(*self.canvas_size)
+        # init tetris state (reglas en engine.TetrisEngine)
+        self.t_speed = cfg.tick_ms(0)  # ms per fall step
+        seed = replay.seed if replay else new_seed()
+        self.tetris = TetrisEngine(**cfg.engine_args(), seed=seed)
+        self._begin_recording("tetris", seed, cfg)
+        self.t_view.palette = tetris_palette(self.tetris.color_names, cfg.colors)
         self._draw_tetris()
+        if self.tetris.over:
+            self._tetris_game_over()
+            return
         # set info text
-        self.info_label.config(text=f"Tetris — Puntaje: {self.t_score}")
+        self.info_label.config(text=f"Tetris — Puntaje: {self.tetris.score}")
         # schedule step
         self._tetris_schedule()
 
-    def _spawn_t_piece(self):
-        self.t_piece, self.t_piece_color = random.choice(self.t_pieces)
-        # copy matrix
-        self.t_piece = [list(row) for row in self.t_piece]
-        self.t_piece_y = 0
-        self.t_piece_x = random.randint(0, self.t_width - len(self.t_piece[0]))
-        # ensure fit
-        if self._tetris_collides(self.t_piece_x, self.t_piece_y, self.t_piece):
-            # immediate game over
-            self._tetris_game_over()
-    def _rotate_matrix(self, m):
-        return [list(row) for row in zip(*m[::-1])]
-
-    def _tetris_collides(self, nx, ny, piece):
-        for py, row in enumerate(piece):
-            for px, val in enumerate(row):
-                if val:
-                    x = nx+px
-                    y = ny+py
-                    if x < 0 or x >= self.t_width or y < 0 or y >= self.t_height:
-                        return True
-                    if self.t_board[y][x]:
-                        return True
-        return False
-
-    def _tetris_lock_piece(self):
-        for py, row in enumerate(self.t_piece):
-            for px, val in enumerate(row):
-                if val:
-                    x = self.t_piece_x+px
-                    y = self.t_piece_y+py
-                    if 0 <= y < self.t_height and 0 <= x < self.t_width:
-                        self.t_board[y][x] = self.t_piece_color
-        self._tetris_clear_lines()
-        self.t_score += 50
-        self._spawn_t_piece()
-
-    def _tetris_clear_lines(self):
-        new_board = [row for row in self.t_board if any(cell==0 for cell in row)]
-        removed = self.t_height - len(new_board)
-        for _ in range(removed):
-            new_board.insert(0, [0]*self.t_width)
-        if removed>0:
-            self.t_board = new_board
-            self.t_score += removed*100
+    def start_tetris_bot(self):
+        """Tetris jugado por el bot (una acción por frame)."""
+        if self.running:
+            messagebox.showinfo("En ejecución", "Ya hay un juego en ejecución. Deténlo primero.")
+            return
+        self.start_tetris()
+        if self.running and self.mode == "tetris":
+            self.bot = TetrisBot(lookahead=True)
 
     def _tetris_game_over(self):
         self.running = False
+        self._end_recording(self.tetris)
+        # una grabación que terminó en game over también se verifica
+        verdict = self._replay_verdict(self.tetris) if self.player else None
+        self.player = None
         self.mode = None
         self.canvas.create_text(self.WIN_W//2, 30, text="GAME OVER", fill="white", font=("Arial", 24))
-        messagebox.showinfo("Game Over", f"Tetris terminó. Puntaje: {self.t_score}")
+        messagebox.showinfo("Game Over", f"Tetris terminó. Puntaje: {self.tetris.score}")
+        if verdict:
+            self.info_label.config(text=verdict)
 
     def _draw_tetris(self):
-        self.canvas.delete("all")
-        bw = self.t_width * self.cell
-        bh = self.t_height * self.cell
-        x0 = self.t_margin_x
-        y0 = self.t_margin_y
-
-        # fondo del tablero
-        self.canvas.create_rectangle(x0-2, y0-2, x0+bw+2, y0+bh+2,
-                                    fill="#111", outline="#333")
-
-        # bloques fijos
-        for y in range(self.t_height):
-            for x in range(self.t_width):
-                cell = self.t_board[y][x]
-                if cell:
-                    self._draw_cell(x0 + x*self.cell, y0 + y*self.cell, self.cell, cell)
-
-        # pieza activa
-        for py, row in enumerate(self.t_piece):
-            for px, val in enumerate(row):
-                if val:
-                    cx = x0 + (self.t_piece_x+px)*self.cell
-                    cy = y0 + (self.t_piece_y+py)*self.cell
-                    self._draw_cell(cx, cy, self.cell, self.t_piece_color)
-
-        # líneas de cuadrícula
-        for i in range(self.t_width+1):
-            self.canvas.create_line(x0+i*self.cell, y0, x0+i*self.cell, y0+bh, fill="#222")
-        for j in range(self.t_height+1):
-            self.canvas.create_line(x0, y0+j*self.cell, x0+bw, y0+j*self.cell, fill="#222")
-
-        # puntaje a la derecha
-        self.canvas.create_text(
-            x0 + bw + 80, y0 + 20,
-            text=f"Puntaje: {self.t_score}",
-            fill="white",
-            font=("Arial", 12),
-            anchor="w"
-        )
-
-        # ============================
-        # BARRA DE COMANDOS INFERIOR
-        # ============================
-        bar_text = (
-            "1=Izq | 2=Abajo | 3=Der | 4=Pausa | "
-            "5=Drop | 6=Power | 7=Rotar | 0=Salir"
-        )
-        # --- NUEVO: usar el alto REAL DEL CANVAS ---
-        cW = self.canvas.winfo_width()
-        cH = self.canvas.winfo_height()
-
-        self.canvas.create_rectangle(
-            0, cH - 35, cW, cH,
-            fill="#222", outline="#444"
-        )
-        self.canvas.create_text(
-            cW // 2, cH - 18,
-            text=bar_text,
-            fill="white",
-            font=("Arial", 11)
-        )
-
+        cw, ch = self.canvas_size
+        touched = self.t_view.layout(self.t_margin_x, self.t_margin_y,
+                                     self.t_width, self.t_height, self.cell, cw, ch)
 
-    def _draw_cell(self, x, y, s, color_name):
-        # map color names to hex
-        cmap = {
-            "yellow":"#FFD54A","cyan":"#4DD0E1","green":"#AED581",
-            "red":"#EF5350","orange":"#FF8A65","blue":"#42A5F5","magenta":"#CE93D8"
-        }
-        c = cmap.get(color_name, "#FFFFFF")
-        self.canvas.create_rectangle(x+1,y+1,x+s-1,y+s-1,fill=c,outline="#111")
+        # cantidad de items del canvas tocados en este frame (layout + celdas)
+        self.t_frame_items = touched + self.t_view.draw(self.tetris.colors, self.tetris.cells(),
+                                                        self.tetris.color, self.tetris.score)
 
     def _tetris_step(self):
         if not (self.running and self.mode=="tetris"):
             return
-        # try move down
-        if not self._tetris_collides(self.t_piece_x, self.t_piece_y+1, self.t_piece):
-            self.t_piece_y += 1
-        else:
-            # cannot move down -> lock
-            self._tetris_lock_piece()
-        # redraw
-        self._draw_tetris()
-        self.info_label.config(text=f"Tetris — Puntaje: {self.t_score}")
-        # schedule next
-        self._after_id = self.canvas.after(self.t_speed, self._tetris_step)
+        if self.player:
+            for action in self.player.actions():
+                self._tetris_action(action)
+                if not self.running:
+                    return
+            if self._replay_finished(self.tetris):
+                return
+            self.player.tick()
+        events = self.tetris.step(TICK)
+        if self.recorder:
+            self.recorder.tick()
+        self.info_label.config(text=f"Tetris — Puntaje: {self.tetris.score}")
+        # la velocidad sube con el nivel (tabla precalculada)
+        self._update_speed(self.t_cfg.tick_ms(self.tetris.score))
+        if events & EV_GAME_OVER:
+            self._draw_tetris()
+            self._tetris_game_over()
 
     def _tetris_schedule(self):
         # start stepping
-        if self._after_id:
-            try:
-                self.canvas.after_cancel(self._after_id)
-            except Exception:
-                pass
-        self._after_id = self.canvas.after(self.t_speed, self._tetris_step)
+        self._start_loop(self.t_speed, self._tetris_step, self._draw_tetris, self._tetris_drain)
 
     def _tetris_handle_key(self, keysym, char):
         # map keys to actions per original mapping
@@ -420,239 +599,166 @@ class MasterGame:
         if key=="0":
             self.stop_game()
             return
-        if key=="1":
-            if not self._tetris_collides(self.t_piece_x-1, self.t_piece_y, self.t_piece):
-                self.t_piece_x -= 1
-        elif key=="2":
-            if not self._tetris_collides(self.t_piece_x, self.t_piece_y+1, self.t_piece):
-                self.t_piece_y += 1
-        elif key=="3":
-            if not self._tetris_collides(self.t_piece_x+1, self.t_piece_y, self.t_piece):
-                self.t_piece_x += 1
-        elif key == "4":
+        if key == "4":
+            self.toggle_pause()
+            return
+        if self.paused or self.player or self.bot:
+            return
+        action = TETRIS_KEYS.get(key)
+        if action is not None:
+            self.inputs.push(action)
+
+    def _tetris_drain(self):
+        """Aplica las teclas del frame ya compactadas, con un solo sonido."""
+        if self.bot:
+            # la decisión corre dentro del frame: medio frame (o medio tick) como mucho
+            budget = min(FRAME_MS, self.t_speed) / 2
+            self._tetris_action(self.bot.next_action(self.tetris, budget))
+            return
+        actions = coalesce_tetris(self.inputs.drain())
+        for action in actions:
+            self._tetris_action(action)
             if not self.running:
                 return
-
-            self.running = False
-            if self._after_id:
-                try:
-                    self.canvas.after_cancel(self._after_id)
-                except:
-                    pass
-
-            # obtener tamaño REAL del canvas
-            cw = self.canvas.winfo_width()
-            ch = self.canvas.winfo_height()
-
-            # mensaje de pausa
-            self.pause_msg = self.canvas.create_text(
-                cw//2, 50,
-                text="PAUSA (7 seg)",
-                fill="yellow",
-                font=("Arial", 24, "bold")
-            )
-
-            self.canvas.update()
-            self.canvas.after(7000, self._resume_after_pause)
-            return
-        elif key=="5":
-            # impulso: drop until collision
-            while not self._tetris_collides(self.t_piece_x, self.t_piece_y+1, self.t_piece):
-                self.t_piece_y += 1
-            self._tetris_lock_piece()
-        elif key == "6":
-            # POWER ok
-            if self.t_score >= 1000 and not self.t_power_used:
-
-                for y in range(self.t_height):
-                    for x in range(self.t_width):
-                        self.t_board[y][x] = 0
-
-                self.t_power_used = True
-
-                cw = self.canvas.winfo_width()
-                ch = self.canvas.winfo_height()
-
-                msg = self.canvas.create_text(
-                    cw//2, ch//2,
-                    text="POWER ACTIVADO",
-                    fill="yellow",
-                    font=("Arial", 26, "bold")
-                )
-                self.canvas.update()
-                self.canvas.after(900)
-                self.canvas.delete(msg)
-
+        if actions:
+            self.audio.play("key")
+
+    def _tetris_action(self, action):
+        """Aplica una acción del jugador (o de la grabación) con sus efectos."""
+        if self.recorder:
+            self.recorder.action(action)
+        events = self.tetris.step(action)
+        cw, ch = self.canvas_size
+        if events & EV_POWER:
+            self.effects.text(cw//2, ch//2, "POWER ACTIVADO", 900,
+                              fill="yellow", font=("Arial", 26, "bold"))
+        elif events & (EV_POWER_USED | EV_POWER_LOCKED):
+            # falla del power: puntaje insuficiente o ya usado
+            if events & EV_POWER_USED:
+                texto = "El POWER ya fue usado"
             else:
-                # falla del power: puntaje insuficiente o ya usado
-                cw = self.canvas.winfo_width()
-                ch = self.canvas.winfo_height()
-
-                if self.t_power_used:
-                    texto = "El POWER ya fue usado"
-                else:
-                    texto = "Necesitas 1000 puntos"
-
-                # parpadeo rojo
-                self.canvas.create_rectangle(0,0,cw,ch, fill="#550000")
-                self.canvas.update()
-                self.canvas.after(60)
-
-                # mensaje de error
-                msg = self.canvas.create_text(
-                    cw//2, ch//2,
-                    text=texto,
-                    fill="red",
-                    font=("Arial", 24, "bold")
-                )
-                self.canvas.update()
-                self.canvas.after(900)
-                self.canvas.delete(msg)
-        elif key == "7":
-            # Rotación con validación de bordes
-            newp = self._rotate_matrix(self.t_piece)
-
-            # Si choca, intenta corregir moviendo 1 a la izquierda o derecha
-            if not self._tetris_collides(self.t_piece_x, self.t_piece_y, newp):
-                self.t_piece = newp
-            elif not self._tetris_collides(self.t_piece_x - 1, self.t_piece_y, newp):
-                self.t_piece_x -= 1
-                self.t_piece = newp
-            elif not self._tetris_collides(self.t_piece_x + 1, self.t_piece_y, newp):
-                self.t_piece_x += 1
-                self.t_piece = newp
-            # Si no se pudo corregir → no se rota (validación)
-        # play sound per key
-        try:
-            if self.snd_tetris:
-                self.snd_tetris.play()
-        except Exception:
-            pass
-        # redraw
-        self._draw_tetris()
-    def _resume_after_pause(self):
-        # borrar texto si existe
-        if hasattr(self, "pause_msg"):
-            self.canvas.delete(self.pause_msg)
+                texto = "Necesitas 1000 puntos"
+            # parpadeo rojo y mensaje de error
+            self.effects.flash("#550000", 960, self.canvas_size)
+            self.effects.text(cw//2, ch//2, texto, 900, fill="red")
+        if events & EV_GAME_OVER:
+            self._draw_tetris()
+            self._tetris_game_over()
+            return
+        # el bucle redibuja en el próximo frame
+        self._dirty = True
 
-        self.running = True
-        self._tetris_schedule()
     # =========================
     #  SNAKE implementation
     # =========================
-    def start_snake(self):
+    def start_snake(self, replay=None):
         if self.running:
             messagebox.showinfo("En ejecución", "Ya hay un juego en ejecución. Deténlo primero.")
             return
         self.mode = "snake"
         self.running = True
+        self.autopilot = None
+        self._clear_canvas()
         # grid
-        self.s_cols = 30
-        self.s_rows = 20
-        self.s_cell = 20
-        # position canvas margin
-        canvas_w = max(self.canvas.winfo_width(), (self.s_cols*self.s_cell)+40)
-        canvas_h = max(self.canvas.winfo_height(), (self.s_rows*self.s_cell)+40)
-        self.s_margin_x = (canvas_w - (self.s_cols*self.s_cell))//2
-        self.s_margin_y = (canvas_h - (self.s_rows*self.s_cell))//2
-        # snake state
-        self.s_snake = [(self.s_cols//2, self.s_rows//2)]
-        self.s_dir = (1,0)
-        self.s_speed = 120  # ms per step
-        self.s_score = 0
-        self._place_food()
+        cfg = self.s_cfg = replay.settings if replay else self.s_settings
+        self.s_cols = cfg.cols
+        self.s_rows = cfg.rows
+        self._layout_snake(*self.canvas_size)
+        # snake state (reglas en engine.SnakeEngine)
+        self.s_speed = cfg.tick_ms(0)  # ms per step
+        seed = replay.seed if replay else new_seed()
+        self.snake = SnakeEngine(**cfg.engine_args(), seed=seed)
+        self._begin_recording("snake", seed, cfg)
         self._draw_snake()
-        self.info_label.config(text=f"Snake — Puntaje: {self.s_score}")
+        self.info_label.config(text=f"Snake — Puntaje: {self.snake.score}")
         # schedule
-        self._after_id = self.canvas.after(self.s_speed, self._snake_step)
-
-    def _place_food(self):
-        while True:
-            x = random.randint(0, self.s_cols-1)
-            y = random.randint(0, self.s_rows-1)
-            if (x,y) not in self.s_snake:
-                self.s_food = (x,y)
-                break
+        self._start_loop(self.s_speed, self._snake_step, self._draw_snake)
+
+    def start_snake_autopilot(self):
+        """Snake manejado por el piloto automático (un giro por paso)."""
+        if self.running:
+            messagebox.showinfo("En ejecución", "Ya hay un juego en ejecución. Deténlo primero.")
+            return
+        self.start_snake()
+        if self.running and self.mode == "snake":
+            self.autopilot = SnakeAutopilot(self.snake)
 
     def _draw_snake(self):
-        self.canvas.delete("all")
-        # background
-        grid_w = self.s_cols*self.s_cell
-        grid_h = self.s_rows*self.s_cell
-        x0 = self.s_margin_x
-        y0 = self.s_margin_y
-        self.canvas.create_rectangle(x0-2,y0-2,x0+grid_w+2,y0+grid_h+2,fill="#111",outline="#333")
-        # draw food
-        fx,fy = self.s_food
-        self.canvas.create_rectangle(x0+fx*self.s_cell+2, y0+fy*self.s_cell+2,
-                                     x0+(fx+1)*self.s_cell-2, y0+(fy+1)*self.s_cell-2,
-                                     fill="#ff3333", outline="#111")
-        # draw snake
-        for i,(sx,sy) in enumerate(self.s_snake):
-            color = "#66ff66" if i==0 else "#009933"
-            self.canvas.create_rectangle(x0+sx*self.s_cell+2, y0+sy*self.s_cell+2,
-                                         x0+(sx+1)*self.s_cell-2, y0+(sy+1)*self.s_cell-2,
-                                         fill=color, outline="#111")
-        # score
-        self.canvas.create_text(x0+grid_w+80, y0+20, text=f"Puntaje: {self.s_score}", fill="white", font=("Arial",12), anchor="w")
+        touched = self.s_view.layout(self.s_margin_x, self.s_margin_y, self.s_cols, self.s_rows, self.s_cell)
+        # cantidad de items del canvas tocados en este frame (layout + celdas)
+        self.s_frame_items = touched + self.s_view.draw(self.snake.snake, self.snake.food, self.snake.score,
+                                                        self.s_cfg.food_colors[self.snake.food_kind])
 
     def _snake_step(self):
         if not (self.running and self.mode=="snake"):
             return
-        # compute new head
-        hx,hy = self.s_snake[0]
-        dx,dy = self.s_dir
-        nx,ny = hx+dx, hy+dy
-        # collision
-        if nx<0 or nx>=self.s_cols or ny<0 or ny>=self.s_rows or (nx,ny) in self.s_snake:
-            # game over
-            messagebox.showinfo("Game Over", f"Snake terminó. Puntaje: {self.s_score}")
+        if self.player:
+            for action in self.player.actions():
+                self.snake.turn(action)
+            if self._replay_finished(self.snake):
+                return
+            self.player.tick()
+        elif self.autopilot:
+            action = self.autopilot.next_action()
+            if action and DIRECTIONS[action] != self.snake.dir:
+                if self.recorder:
+                    self.recorder.action(action)
+                self.snake.turn(action)
+        else:
+            # un solo giro por paso, validado contra la dirección en que se movió
+            action = next_snake_turn(self.inputs, self.snake.dir)
+            if action:
+                if self.recorder:
+                    self.recorder.action(action)
+                self.snake.turn(action)
+                self.audio.play("key")
+        events = self.snake.step()
+        if self.recorder:
+            self.recorder.tick()
+        if events & EV_WIN:
+            self._end_recording(self.snake)
+            verdict = self._replay_verdict(self.snake) if self.player else None
+            self.player = None
+            self._draw_snake()
+            messagebox.showinfo("Victoria", f"¡La serpiente llenó el tablero! Puntaje: {self.snake.score}")
             self.running = False
             self.mode = None
             self._show_menu_info()
+            if verdict:
+                self.info_label.config(text=verdict)
             return
-        # move
-        self.s_snake.insert(0,(nx,ny))
-        if (nx,ny)==self.s_food:
-            self.s_score += 10
-            self._place_food()
-            try:
-                if self.snd_snake:
-                    self.snd_snake.play()
-            except Exception:
-                pass
-        else:
-            self.s_snake.pop()
-        self._draw_snake()
-        self.info_label.config(text=f"Snake — Puntaje: {self.s_score}")
-        self._after_id = self.canvas.after(self.s_speed, self._snake_step)
+        if events & EV_GAME_OVER:
+            self._end_recording(self.snake)
+            verdict = self._replay_verdict(self.snake) if self.player else None
+            self.player = None
+            messagebox.showinfo("Game Over", f"Snake terminó. Puntaje: {self.snake.score}")
+            self.running = False
+            self.mode = None
+            self._show_menu_info()
+            if verdict:
+                self.info_label.config(text=verdict)
+            return
+        if events & EV_FOOD:
+            self._update_speed(self.s_cfg.tick_ms(self.snake.score))
+            self.audio.play("eat")
+        self.info_label.config(text=f"Snake — Puntaje: {self.snake.score}")
 
     def _snake_handle_key(self, keysym, char):
         key = char.lower() if char else keysym
-        if key in ("w","Up","W","Up"):
-            if self.s_dir!=(0,1):
-                self.s_dir=(0,-1)
-        elif key in ("s","Down","S","Down"):
-            if self.s_dir!=(0,-1):
-                self.s_dir=(0,1)
-        elif key in ("a","Left","A","Left"):
-            if self.s_dir!=(1,0):
-                self.s_dir=(-1,0)
-        elif key in ("d","Right","D","Right"):
-            if self.s_dir!=(-1,0):
-                self.s_dir=(1,0)
+        action = SNAKE_KEYS.get(key)
+        if action:
+            if not (self.player or self.autopilot):
+                self.inputs.push(action)
         elif key in ("q","Q"):
             self.stop_game()
 
-        try:
-            if self.snd_tetris:
-                self.snd_tetris.play()
-        except Exception:
-            pass
-
 # ============================
 # Ejecutar la app
 # ============================
 if __name__ == "__main__":
-    app = MasterGame()
+    ap = argparse.ArgumentParser(description="MasterGame — Tetris + Snake")
+    ap.add_argument("--trace", help=f"guardar un trace en formato Chrome (o {TRACE_ENV})")
+    ap.add_argument("--cprofile", help=f"perfilar la sesión con cProfile (o {CPROFILE_ENV})")
+    args = ap.parse_args()
+    app = MasterGame(trace=args.trace, cprofile=args.cprofile)
     app.start()
@@ -0,0 +1,235 @@
+# ============================
+# Simulador por lotes (sin interfaz)
+# ============================
+# Corre muchas partidas con semilla de Tetris o Snake usando los mismos
+# motores que el juego (engine.py) y los parámetros de Tetris.txt/Snake.txt,
+# repartidas en un ProcessPoolExecutor. Cada partida se escribe apenas termina
+# su lote (CSV o JSON lines) y al final se imprime un resumen agregado.
+#
+#   python simulate.py tetris --games 10000 --workers 8 --out tetris.csv
+#   python simulate.py snake --games 2000 --out snake.jsonl --summary resumen.json
+
+import argparse
+import csv
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from engine import TetrisEngine, SnakeEngine, DIRECTIONS, LEFT, RIGHT, ROTATE, TICK, EV_FOOD
+from autopilot import SnakeAutopilot
+from bot import TetrisBot
+from gameconfig import load_settings
+
+TETRIS_FIELDS = ("seed", "score", "lines", "pieces", "ticks", "game_seconds", "over")
+SNAKE_FIELDS = ("seed", "score", "length", "foods", "ticks", "game_seconds", "won", "over")
+
+# configuración del proceso trabajador (se carga una vez por proceso)
+_settings = None
+
+
+def _init_worker(tetris_path, snake_path):
+    global _settings
+    _settings = load_settings(tetris_path, snake_path)
+
+
+# ---------------------------
+# Políticas de juego
+# ---------------------------
+def tetris_random_policy(rng):
+    """Antes de cada tick: hasta 3 movimientos al azar (o ninguno)."""
+    moves = (LEFT, RIGHT, ROTATE, None)
+    def policy(engine):
+        return [m for m in (rng.choice(moves) for _ in range(rng.randint(0, 3))) if m]
+    return policy
+
+
+def tetris_bot_policy(rng, lookahead=False):
+    """El bot de bot.py: lleva cada pieza a su lugar antes del próximo tick."""
+    bot = TetrisBot(lookahead=lookahead)
+    def policy(engine):
+        # generador: cada acción se aplica antes de pedir la siguiente
+        placed = engine.placed
+        while not engine.over and engine.placed == placed:
+            yield bot.next_action(engine)
+    return policy
+
+
+def snake_greedy_policy(rng):
+    """Se acerca a la comida evitando chocar en el próximo paso."""
+    def policy(engine):
+        hx, hy = engine.snake[0]
+        fx, fy = engine.food
+        cols, grid = engine.cols, engine.grid
+        best, best_d = None, None
+        options = list(DIRECTIONS.items())
+        rng.shuffle(options)
+        for name, (dx, dy) in options:
+            if (dx, dy) == (-engine.dir[0], -engine.dir[1]):
+                continue
+            nx, ny = hx + dx, hy + dy
+            if not (0 <= nx < cols and 0 <= ny < engine.rows) or grid[ny*cols + nx]:
+                continue
+            d = abs(fx - nx) + abs(fy - ny)
+            if best_d is None or d < best_d:
+                best, best_d = name, d
+        return best
+    return policy
+
+
+def snake_autopilot_policy(rng):
+    """El piloto automático de autopilot.py (se arma con la primera partida)."""
+    pilot = None
+    def policy(engine):
+        nonlocal pilot
+        if pilot is None:
+            pilot = SnakeAutopilot(engine)
+        return pilot.next_action()
+    return policy
+
+
+POLICIES = {
+    "tetris": {
+        "random": tetris_random_policy,
+        "bot": tetris_bot_policy,
+        "bot-lookahead": lambda rng: tetris_bot_policy(rng, lookahead=True),
+    },
+    "snake": {"greedy": snake_greedy_policy, "autopilot": snake_autopilot_policy},
+}
+
+
+# ---------------------------
+# Partidas
+# ---------------------------
+def play_tetris(settings, seed, policy_name, max_ticks):
+    engine = TetrisEngine(**settings.engine_args(), seed=seed)
+    policy = POLICIES["tetris"][policy_name](random.Random(seed ^ 0x5EED))
+    ticks = 0
+    game_ms = 0
+    while not engine.over and ticks < max_ticks:
+        for action in policy(engine):
+            engine.step(action)
+        engine.step(TICK)
+        game_ms += settings.tick_ms(engine.score)
+        ticks += 1
+    return {"seed": seed, "score": engine.score, "lines": engine.lines, "pieces": engine.placed,
+            "ticks": ticks, "game_seconds": game_ms / 1000.0, "over": engine.over}
+
+
+def play_snake(settings, seed, policy_name, max_ticks):
+    engine = SnakeEngine(**settings.engine_args(), seed=seed)
+    policy = POLICIES["snake"][policy_name](random.Random(seed ^ 0x5EED))
+    ticks = 0
+    foods = 0
+    game_ms = 0
+    while not engine.over and ticks < max_ticks:
+        if engine.step(policy(engine)) & EV_FOOD:
+            foods += 1
+        game_ms += settings.tick_ms(engine.score)
+        ticks += 1
+    return {"seed": seed, "score": engine.score, "length": len(engine.snake), "foods": foods,
+            "ticks": ticks, "game_seconds": game_ms / 1000.0, "won": engine.won,
+            "over": engine.over}
+
+
+def run_batch(game, seeds, policy_name, max_ticks):
+    """Juega un lote de semillas en el proceso trabajador."""
+    tetris, snake = _settings
+    if game == "tetris":
+        return [play_tetris(tetris, seed, policy_name, max_ticks) for seed in seeds]
+    return [play_snake(snake, seed, policy_name, max_ticks) for seed in seeds]
+
+
+# ---------------------------
+# Resumen
+# ---------------------------
+def summarize(values):
+    if not values:
+        return {}
+    ordered = sorted(values)
+    def pct(p):
+        return ordered[min(len(ordered) - 1, int(p / 100.0 * len(ordered)))]
+    return {
+        "mean": statistics.fmean(ordered),
+        "stdev": statistics.pstdev(ordered),
+        "min": ordered[0], "p10": pct(10), "p50": pct(50), "p90": pct(90), "p99": pct(99),
+        "max": ordered[-1],
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Simulación por lotes de Tetris/Snake")
+    ap.add_argument("game", choices=("tetris", "snake"))
+    ap.add_argument("--games", type=int, default=1000)
+    ap.add_argument("--seed", type=int, default=0, help="semilla de la primera partida")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--batch", type=int, default=0,
+                    help="partidas por tarea (por defecto se reparte en ~8 tareas por trabajador)")
+    ap.add_argument("--policy", default=None, help="política de juego (tetris: random, bot, bot-lookahead; snake: greedy, autopilot)")
+    ap.add_argument("--max-ticks", type=int, default=200000)
+    ap.add_argument("--tetris-config", default="Tetris.txt")
+    ap.add_argument("--snake-config", default="Snake.txt")
+    ap.add_argument("--out", help="resultados por partida: .csv o JSON lines (.jsonl/.json)")
+    ap.add_argument("--summary", help="guardar el resumen agregado en este JSON")
+    args = ap.parse_args(argv)
+
+    policy = args.policy or next(iter(POLICIES[args.game]))
+    if policy not in POLICIES[args.game]:
+        ap.error(f"política desconocida para {args.game}: {policy}")
+    fields = TETRIS_FIELDS if args.game == "tetris" else SNAKE_FIELDS
+    batch = args.batch or max(1, args.games // (args.workers * 8))
+    seeds = range(args.seed, args.seed + args.games)
+    batches = [seeds[i:i + batch] for i in range(0, len(seeds), batch)]
+
+    out = writer = None
+    if args.out:
+        out = open(args.out, "w", newline="", encoding="utf-8")
+        if args.out.endswith(".csv"):
+            writer = csv.DictWriter(out, fieldnames=fields)
+            writer.writeheader()
+
+    results = {name: [] for name in ("score", "ticks", "game_seconds",
+                                     "lines" if args.game == "tetris" else "length")}
+    t0 = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(args.workers, initializer=_init_worker,
+                                 initargs=(args.tetris_config, args.snake_config)) as pool:
+            futures = [pool.submit(run_batch, args.game, list(b), policy, args.max_ticks)
+                       for b in batches]
+            for future in as_completed(futures):
+                for row in future.result():
+                    for name, values in results.items():
+                        values.append(row[name])
+                    if writer:
+                        writer.writerow(row)
+                    elif out:
+                        out.write(json.dumps(row) + "\n")
+                if out:
+                    out.flush()
+    finally:
+        if out:
+            out.close()
+    elapsed = time.perf_counter() - t0
+
+    summary = {
+        "game": args.game,
+        "policy": policy,
+        "games": args.games,
+        "workers": args.workers,
+        "elapsed_s": elapsed,
+        "games_per_s": args.games / elapsed if elapsed else 0.0,
+        "ticks_per_s": sum(results["ticks"]) / elapsed if elapsed else 0.0,
+        "stats": {name: summarize(values) for name, values in results.items()},
+    }
+    print(json.dumps(summary, indent=4, ensure_ascii=False))
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=4, ensure_ascii=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+"""Paridad de batch_numpy.BatchTetris con engine.TetrisEngine, semilla por semilla."""
+
+import os
+
+import pytest
+
+pytest.importorskip("numpy")
+
+import batch_numpy
+from analisador import load_config
+from engine import TetrisEngine
+from gameconfig import tetris_settings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def tetris_txt(tmp_path):
+    # caché en un directorio temporal: el test no deja archivos en el repositorio
+    return tetris_settings(load_config(os.path.join(ROOT, "Tetris.txt"), cache_dir=str(tmp_path)))
+
+
+def test_parity_default_pieces():
+    assert batch_numpy.parity(games=40, steps=800, seed=0) == []
+
+
+def test_parity_tetris_txt_pieces(tetris_txt):
+    assert batch_numpy.parity(games=40, steps=800, seed=100, settings=tetris_txt) == []
+
+
+def test_parity_runs_games_to_the_end():
+    # tablero chico: las partidas terminan y se compara también el game over
+    settings = tetris_settings({"ancho": 6, "alto": 8})
+    assert batch_numpy.parity(games=30, steps=400, seed=7, settings=settings) == []
+
+
+def test_spawn_matches_engine(tetris_txt):
+    seeds = range(20)
+    batch = batch_numpy.BatchTetris(seeds, **tetris_txt.engine_args())
+    for g, seed in enumerate(seeds):
+        assert batch_numpy.mismatch(batch, TetrisEngine(**tetris_txt.engine_args(), seed=seed), g) is None
+
+
+def test_mismatch_reports_first_difference():
+    batch = batch_numpy.BatchTetris([3])
+    engine = TetrisEngine(seed=3)
+    batch.score[0] += 1
+    assert batch_numpy.mismatch(batch, engine, 0).startswith("score:")